@@ -0,0 +1,120 @@
+import shutil
+import struct
+import subprocess
+from collections import deque
+
+from PIL import GifImagePlugin, Image
+
+from render import BACKGROUND, FramePainter, ValueColors, sample_rows
+
+# --- Animated GIF / MP4 Export (NumPy frame buffers, streamed to the encoder) ---
+ANIMATION_WIDTH = 640
+ANIMATION_HEIGHT = 240
+MAX_ANIMATION_FRAMES = 300
+FRAME_DURATION_MS = 50
+ENCODE_BATCH = 16
+PARALLEL_MIN_FRAMES = 64
+# Default cap on batches queued in a pool; callers pass about 2x its workers
+MAX_IN_FLIGHT = 8
+# GIF frames use one global 256-entry palette: 255 colormap levels + background
+GIF_LEVELS = 255
+FORMATS = {'GIF': '.gif', 'MP4': '.mp4'}
+
+
+def ffmpeg_available():
+    return shutil.which('ffmpeg') is not None
+
+def animation_frames(history, max_frames=MAX_ANIMATION_FRAMES):
+    # Evenly sampled frames, produced one at a time (random access per frame)
+    for r in sample_rows(len(history), max_frames):
+        yield history[r]
+
+def gif_header(width, height, palette, loop=0):
+    return (b'GIF89a' + struct.pack('<HHBBB', width, height, 0xF7, GIF_LEVELS, 0) + palette
+            # NETSCAPE2.0 application extension: loop count (0 = forever)
+            + b'!\xff\x0bNETSCAPE2.0\x03\x01' + struct.pack('<H', loop) + b'\x00')
+
+def _encode_batch(fmt, frames, colors, width, height, duration_ms):
+    # Runs in the parent or a worker process: paints frames and returns, per
+    # frame, GIF image blocks (LZW-compressed by Pillow) or raw RGB24 bytes.
+    painter = FramePainter(colors, len(frames[0]), width, height)
+    if fmt == 'MP4':
+        return [painter.paint(frame).tobytes() for frame in frames]
+    palette = colors.lut.tobytes() + bytes(BACKGROUND)
+    encoded = []
+    for frame in frames:
+        image = Image.frombytes('P', (width, height), painter.paint_indices(frame, GIF_LEVELS).tobytes())
+        image.putpalette(palette)
+        encoded.append(b''.join(GifImagePlugin.getdata(image, duration=duration_ms)))
+    return encoded
+
+def _batches(frames, size):
+    batch = []
+    for frame in frames:
+        batch.append(frame)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def encode_frames(fmt, frames, colors, width, height, duration_ms, pool=None, max_in_flight=None):
+    # Yields encoded frames in order. With a pool, batches are encoded in
+    # worker processes with a bounded number in flight, so memory stays flat.
+    if pool is None:
+        for batch in _batches(frames, ENCODE_BATCH):
+            yield from _encode_batch(fmt, batch, colors, width, height, duration_ms)
+        return
+    in_flight = deque()
+    max_in_flight = max_in_flight or MAX_IN_FLIGHT
+    try:
+        for batch in _batches(frames, ENCODE_BATCH):
+            in_flight.append(pool.submit(_encode_batch, fmt, batch, colors, width, height, duration_ms))
+            if len(in_flight) >= max_in_flight:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+def write_gif(out, frames, colors, width=ANIMATION_WIDTH, height=ANIMATION_HEIGHT,
+              duration_ms=FRAME_DURATION_MS, pool=None, max_in_flight=None):
+    colors = ValueColors(colors.low, colors.high, colors.cmap, levels=GIF_LEVELS)
+    out.write(gif_header(width, height, colors.lut.tobytes() + bytes(BACKGROUND)))
+    for data in encode_frames('GIF', frames, colors, width, height, duration_ms, pool, max_in_flight):
+        out.write(data)
+    out.write(b';')
+
+def write_mp4(path, frames, colors, width=ANIMATION_WIDTH, height=ANIMATION_HEIGHT,
+              duration_ms=FRAME_DURATION_MS, pool=None, max_in_flight=None):
+    if not ffmpeg_available():
+        raise RuntimeError("MP4 export needs the ffmpeg executable on PATH.")
+    command = ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+               '-s', f'{width}x{height}', '-r', f'{1000 / duration_ms:g}', '-i', '-',
+               '-vcodec', 'libx264', '-pix_fmt', 'yuv420p', path]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for data in encode_frames('MP4', frames, colors, width, height, duration_ms, pool, max_in_flight):
+            process.stdin.write(data)
+    finally:
+        process.stdin.close()
+        error = process.stderr.read()
+        process.wait()
+    if process.returncode:
+        raise RuntimeError(f"ffmpeg failed: {error.decode(errors='replace').strip()}")
+
+def export_animation(history, colors, path, fmt='GIF', max_frames=MAX_ANIMATION_FRAMES,
+                     duration_ms=FRAME_DURATION_MS, pool=None, max_in_flight=None):
+    # Samples at most max_frames steps of a trace; the pool is only used for
+    # animations long enough to pay for sending frames to the workers, with
+    # at most max_in_flight batches queued at once.
+    frames = animation_frames(history, max_frames)
+    if min(len(history), max_frames) < PARALLEL_MIN_FRAMES:
+        pool = None
+    if fmt == 'MP4':
+        write_mp4(path, frames, colors, duration_ms=duration_ms, pool=pool, max_in_flight=max_in_flight)
+    else:
+        with open(path, 'wb') as out:
+            write_gif(out, frames, colors, duration_ms=duration_ms, pool=pool, max_in_flight=max_in_flight)
+    return path
@@ -1,34 +1,21 @@
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
 
-st.set_page_config(layout="wide")
+from race import QUADRATIC_MAX_SIZE, QUADRATIC_SORTS, RACE_TIMEOUT, race_table, run_race
+from sorting import ALGORITHMS, KeyframeTrace, NullTrace, SortStats, run_sort
+from trace_cache import TraceCache, figure_key, history_key
 
-# --- Sidebar Layout (pure Streamlit, left-aligned) ---
-st.markdown("""
-    <style>
-    .nav-button-uniform button {
-        width: 100% !important;
-        min-width: 210px !important;
-        max-width: 210px !important;
-        margin-bottom: 12px !important;
-        border-radius: 10px !important;
-        border: 1.5px solid #444857 !important;
-        font-weight: 500 !important;
-        font-size: 1rem !important;
-        text-align: center !important;
-        align-items: center !important;
-        justify-content: center !important;
-        padding-top: 0.5em !important;
-        padding-bottom: 0.5em !important;
-        background: none !important;
-        color: #e3e6f3 !important;
-        white-space: normal !important;
-        word-break: break-word !important;
-        display: flex !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
+# The NumPy / matplotlib based modules are imported by the Visualization page
+# itself, so the Home and Details pages start without loading them.
+
+st.set_page_config(layout="wide")
 
 # --- Sidebar Layout (left-aligned and uniform width) ---
 with st.sidebar:
@@ -64,128 +51,210 @@ with st.sidebar:
     st.write("Mirabel, Jan Kristian")
     st.write("Sobrepena, Kim")
 
+@st.cache_resource
+def load_asset(path):
+    # Static images are read once per server process, not on every rerun
+    with open(path, 'rb') as f:
+        return f.read()
+
 # --- Sorting & Visualization Functions ---
-def get_color_dict(values):
-    sorted_vals = sorted(set(values), key=lambda x: (isinstance(x, int), x))
-    color_list = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'yellow', 'gray', 'cyan']
-    color_dict = {val: color_list[i % len(color_list)] for i, val in enumerate(sorted_vals)}
-    return color_dict
-
-def bubble_sort_history(arr, order):
-    arr = arr[:]
-    history = [arr[:]]
-    n = len(arr)
-    for i in range(n):
-        for j in range(n - i - 1):
-            if (order == 'ASC' and arr[j] > arr[j + 1]) or (order == 'DESC' and arr[j] < arr[j + 1]):
-                arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                history.append(arr[:])
-    return history
-
-def insertion_sort_history(arr, order):
-    arr = arr[:]
-    history = [arr[:]]
-    for i in range(1, len(arr)):
-        key = arr[i]
-        j = i - 1
-        while j >= 0 and ((order == 'ASC' and arr[j] > key) or (order == 'DESC' and arr[j] < key)):
-            arr[j + 1] = arr[j]
-            j -= 1
-            history.append(arr[:])
-        arr[j + 1] = key
-        history.append(arr[:])
-    return history
-
-def quick_sort_history(arr, order):
-    history = []
-    def _quick_sort(a, l, r):
-        if l < r:
-            pi = partition(a, l, r)
-            _quick_sort(a, l, pi - 1)
-            _quick_sort(a, pi + 1, r)
-    def partition(a, l, r):
-        pivot = a[r]
-        i = l - 1
-        for j in range(l, r):
-            if (order == 'ASC' and a[j] < pivot) or (order == 'DESC' and a[j] > pivot):
-                i += 1
-                if i != j:
-                    a[i], a[j] = a[j], a[i]
-                    history.append(a[:])
-        if i + 1 != r:
-            a[i + 1], a[r] = a[r], a[i + 1]
-            history.append(a[:])
-        return i + 1
-    a = arr[:]
-    history.append(a[:])
-    _quick_sort(a, 0, len(a) - 1)
-    return history
-
-def merge_sort_history(arr, order):
-    history = []
-    def _merge_sort(a, l, r):
-        if l < r:
-            m = (l + r) // 2
-            _merge_sort(a, l, m)
-            _merge_sort(a, m + 1, r)
-            merge(a, l, m, r)
-    def merge(a, l, m, r):
-        left = a[l:m+1]
-        right = a[m+1:r+1]
-        i = j = 0
-        for k in range(l, r + 1):
-            if i < len(left) and (j == len(right) or
-               ((order == 'ASC' and left[i] <= right[j]) or (order == 'DESC' and left[i] >= right[j]))):
-                a[k] = left[i]
-                i += 1
-            else:
-                a[k] = right[j]
-                j += 1
-            history.append(a[:])
-    a = arr[:]
-    history.append(a[:])
-    _merge_sort(a, 0, len(a) - 1)
-    return history
-
-def plot_legend_bar(values, color_dict):
-    fig, ax = plt.subplots(figsize=(len(values), 0.5))
-    for i, val in enumerate(values):
-        ax.barh(0, 1, left=i, color=color_dict[val], edgecolor='black')
-        ax.text(i + 0.5, 0, str(val), ha='center', va='center', color='white', fontsize=12)
-    ax.set_yticks([])
-    ax.set_xticks([])
-    ax.set_xlim(0, len(values))
-    ax.set_title('Legend: Value-Color Mapping', fontsize=12)
-    plt.box(False)
-    plt.tight_layout()
-    return fig
-
-def plot_history_grid(history, color_dict, order_choice):
-    num_steps = len(history)
-    ncols = 3
-    nrows = (num_steps + ncols - 1) // ncols
-    fig, axes = plt.subplots(nrows, ncols, figsize=(12, 3 * nrows))
-    axes = np.array(axes).reshape(-1, ncols)
-    for idx, step in enumerate(history):
-        row = idx // ncols
-        col = idx % ncols
-        ax = axes[row, col] if nrows > 1 else axes[col]
-        bar_colors = [color_dict[v] for v in step]
-        ax.bar(range(len(step)), step, color=bar_colors)
-        ax.set_title(f"Step {idx}")
-        label_text = f"{'Ascending' if order_choice == 'ASC' else 'Descending'} Order"
-        ax.set_xlabel(label_text)
-        ax.set_ylabel('Value')
-        ax.set_ylim(0, max(max(s) for s in history) + 1)
-        ax.set_xticks(range(len(step)))
-        ax.set_xticklabels([str(x) for x in range(len(step))])
-    for j in range(num_steps, nrows * ncols):
-        row = j // ncols
-        col = j % ncols
-        ax = axes[row, col] if nrows > 1 else axes[col]
-        ax.axis('off')
-    plt.tight_layout()
-    return fig
+LARGE_INPUT_THRESHOLD = 50
+MAX_LIST_INPUT = 200_000
+PLAYBACK_FRAMES = 200
+PLAYBACK_INTERVAL = 0.1
+MAX_TRACE_DIR_BYTES = 512 * 1024 * 1024
+WORKER_POOL_SIZE = len(ALGORITHMS)
+
+def figure_to_png(fig):
+    buf = io.BytesIO()
+    if not hasattr(fig, 'savefig'):
+        # Tile canvases are PIL images and are encoded directly
+        fig.save(buf, format='PNG')
+        return buf.getvalue()
+    import matplotlib.pyplot as plt
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+def history_frames(sort_stats, history, max_frames):
+    with sort_stats.phase('trace'):
+        rows = sample_rows(len(history), max_frames)
+        labels = getattr(history, 'frame_steps', lambda: range(len(history)))()
+        return frames_array(history, rows), [labels[r] for r in rows]
+
+def render_trace_png(sort_stats, history, colors, order_choice, view):
+    if view == 'Heatmap':
+        frames, labels = history_frames(sort_stats, history, MAX_HEATMAP_ROWS)
+        return render_png(sort_stats, plot_heatmap, frames, colors, order_choice, labels)
+    frames, labels = history_frames(sort_stats, history, MAX_GRID_FRAMES)
+    return render_png(sort_stats, plot_history_grid, frames, colors, order_choice, labels)
+
+def render_png(sort_stats, plot, *args):
+    with sort_stats.phase('render'):
+        return figure_to_png(plot(*args))
+
+def timed_png(render, *args):
+    # (png, phase timings) as cached together, so a cache hit can still report
+    # what producing the image cost without touching the trace's own stats
+    stats = SortStats()
+    png = render(stats, *args)
+    return png, stats.timings
+
+def add_timings(sort_stats, timings):
+    for name, seconds in timings.items():
+        sort_stats.timings[name] = sort_stats.timings.get(name, 0.0) + seconds
+
+def sort_without_trace(algorithm, values, order):
+    sort_stats = SortStats()
+    with sort_stats.phase('sort'):
+        if algorithm in POOLED_SORTS:
+            result = FAST_SORTS[algorithm](values, order, pool=get_worker_pool())
+        elif algorithm in FAST_SORTS:
+            result = FAST_SORTS[algorithm](values, order)
+        else:
+            arr = values.tolist()
+            result = ALGORITHMS[algorithm](arr, order, NullTrace(arr), sort_stats).result
+    return result, sort_stats
+
+def show_sort_metrics(sort_stats, steps):
+    metrics = sort_stats.as_dict()
+    if steps is not None:
+        metrics['steps'] = steps
+    st.metric("Comparisons", f"{metrics['comparisons']:,}")
+    st.metric("Swaps", f"{metrics['swaps']:,}")
+    st.metric("Writes", f"{metrics['writes']:,}")
+    st.metric("Max Recursion Depth", metrics['max_depth'])
+    for phase in ('sort', 'trace', 'render'):
+        if phase in metrics['timings']:
+            st.metric(f"{phase.capitalize()} Time", f"{metrics['timings'][phase] * 1000:.1f} ms")
+    with st.expander("Raw metrics (JSON)"):
+        st.json(metrics)
+    st.download_button("Download metrics", json.dumps(metrics, indent=2),
+                       file_name="sort_metrics.json", mime="application/json")
+
+def show_race(results, arr, order_choice, show_steps):
+    st.subheader("Algorithm Race")
+    rows = race_table(results)
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    finished = [row for row in rows if row['Status'] == 'ok']
+    st.bar_chart({row['Algorithm']: row['Wall (ms)'] for row in finished}, x_label="Algorithm", y_label="Wall time (ms)")
+    if not show_steps or not finished:
+        return
+    traces = {name: trace for name, (trace, _) in results.items() if trace is not None}
+    longest = max(trace.steps for trace in traces.values())
+    step = st.slider("Step (shared by all algorithms)", min_value=0, max_value=max(longest, 1), value=0)
+    frames = [trace.at_step(step) for trace in traces.values()]
+    titles = [f"{name}: step {min(step, trace.steps):,} of {trace.steps:,}" + (" (done)" if step >= trace.steps else "")
+              for name, trace in traces.items()]
+    st.image(figure_to_png(plot_frame_tiles(frames, titles, ValueColors.from_values(arr), order_choice)),
+             use_container_width=True)
+
+@st.cache_resource
+def get_worker_pool():
+    return ProcessPoolExecutor(max_workers=WORKER_POOL_SIZE, mp_context=multiprocessing.get_context('spawn'))
+
+@st.cache_resource
+def get_trace_cache():
+    return TraceCache(max_bytes=256 * 1024 * 1024)
+
+@st.cache_resource
+def get_frame_cache():
+    return TraceCache(max_bytes=32 * 1024 * 1024)
+
+def playback_frame(key, history, colors, step):
+    # Frames are rendered only when shown and kept in a small LRU
+    return get_frame_cache().get_or_compute(key + (step,), lambda: render_frame(history.at_step(step), colors))
+
+@st.fragment
+def show_playback():
+    # Widgets in here only rerun this fragment. Play animates in a loop that
+    # any click (Pause, the slider) interrupts; the position it reached is
+    # handed to the slider on the next run unless the slider was moved.
+    key, history, colors = st.session_state.playback
+    resume = st.session_state.pop('play_resume', None)
+    if resume is not None and st.session_state.get('play_step') == resume[1]:
+        st.session_state.play_step = resume[0]
+    steps = history.steps
+    play_col, pause_col, slider_col = st.columns([1, 1, 8])
+    play = play_col.button("▶ Play")
+    pause_col.button("⏸ Pause")
+    step = slider_col.slider("Step", min_value=0, max_value=max(steps, 1), key='play_step')
+    image = st.empty()
+    caption = st.empty()
+    note = " (nearest keyframe)" if isinstance(history, KeyframeTrace) else ""
+    image.image(playback_frame(key, history, colors, min(step, steps)), use_container_width=True)
+    caption.caption(f"Step {min(step, steps):,} of {steps:,}{note}")
+    if play:
+        start = 0 if step >= steps else step
+        stride = max(1, steps // PLAYBACK_FRAMES)
+        for current in list(range(start + stride, steps, stride)) + [steps]:
+            st.session_state.play_resume = (current, step)
+            image.image(playback_frame(key, history, colors, current), use_container_width=True)
+            caption.caption(f"Step {current:,} of {steps:,}{note}")
+            time.sleep(PLAYBACK_INTERVAL)
+
+@st.cache_resource
+def get_trace_dir():
+    return tempfile.mkdtemp(prefix='sorttrace-')
+
+def prune_trace_dir(max_bytes=MAX_TRACE_DIR_BYTES):
+    # Uploaded traces stay on disk while they may be replayed; the oldest are
+    # removed once the directory grows past max_bytes (open memory maps of a
+    # removed file stay valid, a later rerun copies the upload again).
+    trace_dir = get_trace_dir()
+    entries = []
+    for name in os.listdir(trace_dir):
+        path = os.path.join(trace_dir, name)
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+def export_trace_file(algorithm, arr, order):
+    # Sorts straight into a trace file on disk, which is removed once read
+    fd, path = tempfile.mkstemp(suffix=TRACE_EXTENSION, dir=get_trace_dir())
+    os.close(fd)
+    try:
+        record_trace(algorithm, arr, order, path)
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+def animation_bytes(history, colors, fmt):
+    fd, path = tempfile.mkstemp(suffix=FORMATS[fmt], dir=get_trace_dir())
+    os.close(fd)
+    try:
+        export_animation(history, colors, path, fmt, pool=get_worker_pool(), max_in_flight=2 * WORKER_POOL_SIZE)
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+def import_trace_file(uploaded):
+    # Uploads are copied to disk once so the trace can be memory-mapped
+    path = os.path.join(get_trace_dir(), f"upload-{uploaded.file_id}{TRACE_EXTENSION}")
+    if not os.path.exists(path):
+        prune_trace_dir(MAX_TRACE_DIR_BYTES - uploaded.size)
+        with open(path, 'wb') as f:
+            f.write(uploaded.getbuffer())
+    else:
+        os.utime(path)
+    try:
+        return TraceFile(path)
+    except TraceStoreError:
+        os.remove(path)
+        raise
 
 # --- Main Page Routing ---
 if st.session_state.page == "Home Page":
@@ -203,25 +272,25 @@ if st.session_state.page == "Home Page":
     - **Bubble Sort** repeatedly steps through the list, compares adjacent items, and swaps them if they are out of order.
     - It continues passing through the list until no swaps are needed, so the array is sorted.
     """)
-    st.image("pics/Bubble.gif", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/Bubble.gif"), caption="Programming Language Interpreter Flow", use_container_width=True)
 
     st.subheader("Insertion Sort")
     st.markdown("""
     - **Insertion Sort** builds the sorted array one item at a time by comparing each new element to those already sorted, inserting it in the correct position.
     """)
-    st.image("pics/Insertion.gif", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/Insertion.gif"), caption="Programming Language Interpreter Flow", use_container_width=True)
     
     st.subheader("Quick Sort")
     st.markdown(""" 
     - **Quick Sort** selects a pivot and partitions the array into two sub-arrays: values less than the pivot and values greater, then recursively sorts the sub-arrays.
     """)
-    st.image("pics/Quick.gif", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/Quick.gif"), caption="Programming Language Interpreter Flow", use_container_width=True)
 
     st.subheader("Merge Sort")
     st.markdown("""
     - **Merge Sort** is a divide-and-conquer algorithm: it splits the list into halves, recursively sorts each, and merges them together in order.
     """)
-    st.image("pics/Merge.gif", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/Merge.gif"), caption="Programming Language Interpreter Flow", use_container_width=True)
 
 elif st.session_state.page == "Details":
     st.title("Project Details")
@@ -236,7 +305,7 @@ elif st.session_state.page == "Details":
     
     """)
 
-    st.image("pics/interpreter.png", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/interpreter.png"), caption="Programming Language Interpreter Flow", use_container_width=True)
 
 
     # Section II
@@ -251,7 +320,7 @@ elif st.session_state.page == "Details":
     """)
     
    
-    st.image("pics/lexical.png", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/lexical.png"), caption="Programming Language Interpreter Flow", use_container_width=True)
    
     st.subheader("Grammar")
     st.write("The interpreter processes commands with the following structure:")
@@ -264,7 +333,7 @@ elif st.session_state.page == "Details":
     st.write("""
     The system design of the Sorting Algorithm Interpreter emphasizes modularity and clarity throughout its structure. The interpreter consists of four primary components: **Lexer**, **Parser**, **Executor**, and an **Integrative Interface**.
     """)
-    st.image("pics/III.png", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/III.png"), caption="Programming Language Interpreter Flow", use_container_width=True)
     
     st.write("""
     When a user inputs a command, the **Lexer** first processes this command by breaking it down into interpretable tokens, systematically identifying keywords, numbers, and symbols.
@@ -283,7 +352,7 @@ elif st.session_state.page == "Details":
     st.write("""
     The Data Preprocessing and Cleaning for this Sorting Algorithm Interpreter occurs primarily within the **Lexer (Lexical Analyzer)** component. When the user inputs a command, the Lexer scans the text, ignores irrelevant whitespace, and detects invalid characters early in the process.
     """)
-    st.image("pics/lexicalw.png", caption="Programming Language Interpreter Flow", use_container_width=True)
+    st.image(load_asset("pics/lexicalw.png"), caption="Programming Language Interpreter Flow", use_container_width=True)
     
     # Section V
     st.header("Section V. Implementation Details")
@@ -367,6 +436,8 @@ class Executor:
             )
             self.last_sorted_array = sorted_array
     """, language="python")
+    st.write("The full Lexer, Parser and Executor live in `interpreter.py`, which can also run whole command scripts in batch:")
+    st.code("python interpreter.py commands.txt [--trace] [--echo] [--keep-going] [--jobs N]", language="bash")
 
     col1, col2 = st.columns(2)
     with col1:
@@ -422,7 +493,7 @@ SORT [17, 10, 3, 9, -8, -2, -6] BY DESC          # Missing algorithm
     st.write("""
     This Sorting Algorithm Interpreter project successfully demonstrates the fundamental principles of programming language design and implementation. Through the development of lexer, parser, and executor components, we gained hands-on experience with:
     """)
-    st.image("pics/conclu.png", caption="Compiler/Interpreter Design Principles", use_container_width=True)
+    st.image(load_asset("pics/conclu.png"), caption="Compiler/Interpreter Design Principles", use_container_width=True)
     
     st.markdown("""
     - **Lexical Analysis:** Breaking down user input into tokens
@@ -444,49 +515,191 @@ SORT [17, 10, 3, 9, -8, -2, -6] BY DESC          # Missing algorithm
     """)
 
 elif st.session_state.page == "Visualization":
+    import numpy as np
+
+    from animation import FORMATS, export_animation, ffmpeg_available
+    from fast_sorts import FAST_SORTS, POOLED_SORTS
+    from ingest import RAW_EXTENSIONS, IngestError, load_file, parse_text
+    from render import (MAX_GRID_FRAMES, MAX_HEATMAP_ROWS, ValueColors, frames_array, plot_frame_tiles, plot_heatmap,
+                        plot_history_grid, plot_legend_bar, render_frame, sample_rows)
+    from trace_store import TRACE_EXTENSION, TraceFile, TraceStoreError, record_trace
+
     st.title("Sorting Algorithm Interpreter — Enhanced Visualizations")
     st.write("""
     You can enter a list of numbers (e.g., 5,3,8,1,7,4,3,3), choose the algorithm, and the order. Press 'Sort & Visualize' to see the sorting steps.
     """)
-    st.caption("Supports Bubble, Insertion, Quick, and Merge Sort Algorithm.")
+    st.caption("Supports Bubble, Insertion, Quick, and Merge Sort Algorithm, plus Introsort "
+               "(iterative Quick Sort with median-of-three pivots, three-way partitioning and a Heap Sort fallback), "
+               "Natural Merge (bottom-up Merge Sort over detected runs with galloping), "
+               "the linear-time integer sorts Counting and Radix (LSD), "
+               "and a trace-free Parallel Sample sort that splits large inputs across worker processes.")
 
     c1, c2, c3 = st.columns([2,1,1])
     with c1:
-        input_list_str = st.text_input("Input List", value="")
+        input_source = st.radio("Input Source", options=["Text", "Upload File", "Trace File"], index=0, horizontal=True)
+        stored = None
+        if input_source == "Text":
+            input_list_str = st.text_input("Input List", value="")
+        elif input_source == "Trace File":
+            uploaded_trace = st.file_uploader("Trace File", type=[TRACE_EXTENSION[1:]],
+                                              help="A trace saved with 'Download trace file'; it is replayed from disk.")
+            if uploaded_trace is not None:
+                try:
+                    stored = import_trace_file(uploaded_trace)
+                except TraceStoreError as e:
+                    st.error(f"Invalid trace file: {e}")
+        else:
+            uploaded = st.file_uploader("Input File", type=['csv', 'txt', 'npy', 'bin', 'raw', 'dat'],
+                                        help="Comma/whitespace separated text or CSV, a NumPy .npy array, "
+                                             "or raw binary integers (.bin/.raw/.dat).")
+            raw_dtype = 'int64'
+            if uploaded is not None and uploaded.name.lower().endswith(RAW_EXTENSIONS):
+                raw_dtype = st.selectbox("Raw binary dtype", options=['int64', 'int32', 'int16', 'int8',
+                                                                      'uint64', 'uint32', 'uint16', 'uint8'])
+    # A loaded trace file fixes the algorithm and order it was recorded with
+    recorded = stored.metadata if stored is not None else {}
     with c2:
-        algorithm = st.selectbox("Algorithm", options=["Bubble", "Insertion", "Quick", "Merge"], index=0)
+        # Trace-free engines (the parallel sample sort) are listed after the visual ones
+        algorithm_options = list(ALGORITHMS) + [name for name in FAST_SORTS if name not in ALGORITHMS]
+        algorithm = st.selectbox("Algorithm", options=algorithm_options,
+                                 index=algorithm_options.index(recorded.get('algorithm', algorithm_options[0])),
+                                 disabled=stored is not None)
     with c3:
-        order_choice = st.radio("Order", options=["ASC", "DESC"], index=0, horizontal=True)
+        order_choice = st.radio("Order", options=["ASC", "DESC"], index=["ASC", "DESC"].index(recorded.get('order', 'ASC')),
+                                horizontal=True, disabled=stored is not None)
 
-    arr = []
+    values = np.empty(0, dtype=np.int64)
     try:
-        arr = [int(x) if x.strip().lstrip('-').isdigit() else None for x in input_list_str.strip().split(',')]
-        arr = [x for x in arr if x is not None]
-    except Exception:
-        st.error("Invalid input: Please enter a comma-separated list of integers.")
-
+        if stored is not None:
+            values = np.asarray(stored.initial_array)
+        elif input_source == "Text":
+            values = parse_text(input_list_str)
+        elif input_source == "Upload File" and uploaded is not None:
+            values = load_file(uploaded.name, uploaded.getbuffer(), raw_dtype)
+    except IngestError as e:
+        st.error(f"Invalid input: {e}")
+    # The step-tracing engines work on Python lists; huge inputs stay NumPy-only
+    arr = values.tolist() if len(values) <= MAX_LIST_INPUT else []
+    if len(values) > MAX_LIST_INPUT:
+        st.info(f"Loaded {len(values):,} values. Inputs above {MAX_LIST_INPUT:,} values are sorted with the "
+                f"NumPy fast path only (untick 'Show step-by-step trace' and choose one of {', '.join(FAST_SORTS)}).")
+
+    race_mode = stored is None and st.checkbox(
+        "Race all algorithms", value=False,
+        help="Run every algorithm on the same input concurrently and compare them side by side. "
+             f"{' and '.join(QUADRATIC_SORTS)} are skipped above {QUADRATIC_MAX_SIZE:,} values; "
+             f"engines still running after {RACE_TIMEOUT:g} s are reported as timed out.")
+    show_steps = stored is not None or (algorithm in ALGORITHMS and st.checkbox(
+        "Show step-by-step trace", value=True,
+        help="Untick to sort without recording steps (NumPy-vectorized for Counting and Radix)."))
+    if algorithm not in ALGORITHMS and not race_mode:
+        st.caption(f"{algorithm} has no step trace; it always runs on the fast path.")
+    large_mode = show_steps and stored is None and st.checkbox(
+        "Large input mode (keyframes only)", value=len(values) > LARGE_INPUT_THRESHOLD,
+        help="Sort at full speed and keep only a bounded set of keyframes plus pass boundaries.")
+    keyframe_budget = st.slider("Keyframe budget", min_value=6, max_value=60, value=24) if large_mode else None
+    variant = ('keyframes', keyframe_budget) if large_mode else ('file', stored.path) if stored is not None else None
+    view = st.radio("View", options=["Bar Grid", "Heatmap", "Playback"], index=0, horizontal=True,
+                    help="Heatmap shows every (sampled) step as one row of colored positions. "
+                         "Playback shows one step at a time with a slider and play/pause.") if show_steps else None
+
+    race_key = history_key(arr, 'Race', order_choice, variant)
+    playback_key = figure_key('frame', arr, algorithm, order_choice, variant) if view == 'Playback' and not race_mode else None
     if st.button("Sort & Visualize"):
-        if not arr:
+        if not len(values):
             st.error("Input list is empty or invalid.")
+        elif not arr and (race_mode or show_steps or algorithm not in FAST_SORTS):
+            st.error(f"Inputs above {MAX_LIST_INPUT:,} values can only use the NumPy fast path: "
+                     f"untick 'Show step-by-step trace' and choose one of {', '.join(FAST_SORTS)}.")
+        elif race_mode:
+            with st.spinner('Racing all algorithms...'):
+                st.session_state.race = (race_key, run_race(arr, order_choice, keyframe_budget=keyframe_budget,
+                                                            pool=get_worker_pool()))
+        elif not show_steps:
+            with st.spinner('Sorting...'):
+                try:
+                    result, sort_stats = sort_without_trace(algorithm, values, order_choice)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    st.subheader("Sorted Output")
+                    st.code(", ".join(map(str, result[:1000])) + (", ..." if len(result) > 1000 else ""))
+                    show_sort_metrics(sort_stats, None)
         else:
             with st.spinner('Sorting...'):
-                color_dict = get_color_dict(arr)
-                if algorithm == 'Bubble':
-                    history = bubble_sort_history(arr, order_choice)
-                elif algorithm == 'Insertion':
-                    history = insertion_sort_history(arr, order_choice)
-                elif algorithm == 'Quick':
-                    history = quick_sort_history(arr, order_choice)
-                elif algorithm == 'Merge':
-                    history = merge_sort_history(arr, order_choice)
+                cache = get_trace_cache()
+                colors = ValueColors.from_values(values)
+                if stored is not None:
+                    history = stored
+                elif algorithm in ALGORITHMS:
+                    try:
+                        history = cache.get_or_compute(
+                            history_key(arr, algorithm, order_choice, variant),
+                            lambda: run_sort(algorithm, arr, order_choice,
+                                             KeyframeTrace(arr, budget=keyframe_budget) if large_mode else None))
+                    except (ValueError, OverflowError) as e:
+                        st.error(str(e))
+                        st.stop()
                 else:
                     st.warning("Algorithm not implemented.")
                     history = [arr[:]]
+                # Per-request copy: the trace (and its stats) is shared through the cache
+                stored_stats = getattr(history, 'stats', None)
+                sort_stats = SortStats.from_dict(stored_stats.as_dict()) if stored_stats else SortStats()
 
                 st.subheader("Legend: Value-Color Mapping")
-                fig_legend = plot_legend_bar(arr, color_dict)
-                st.pyplot(fig_legend)
+                legend_png, timings = cache.get_or_compute(
+                    figure_key('legend', arr, algorithm, order_choice),
+                    lambda: timed_png(render_png, plot_legend_bar, colors, values))
+                add_timings(sort_stats, timings)
+                st.image(legend_png, use_container_width=True)
 
                 st.subheader("Step-by-Step Sorting Visualization")
-                fig_grid = plot_history_grid(history, color_dict, order_choice)
-                st.pyplot(fig_grid)
\ No newline at end of file
+                chart_col, metrics_col = st.columns([4, 1])
+                with chart_col:
+                    if view == 'Playback':
+                        st.session_state.playback = (playback_key, history, colors)
+                        st.session_state.pop('play_step', None)
+                        show_playback()
+                    else:
+                        chart_png, timings = cache.get_or_compute(
+                            figure_key(view, arr, algorithm, order_choice, variant),
+                            lambda: timed_png(render_trace_png, history, colors, order_choice, view))
+                        add_timings(sort_stats, timings)
+                        st.image(chart_png, use_container_width=True)
+                        max_frames = MAX_HEATMAP_ROWS if view == 'Heatmap' else MAX_GRID_FRAMES
+                        if large_mode:
+                            st.caption(f"Showing {min(len(history), max_frames)} keyframes of {history.steps:,} steps "
+                                       f"({len(history.marks):,} pass boundaries).")
+                        elif len(history) > max_frames:
+                            st.caption(f"Showing {max_frames} evenly spaced frames of {len(history):,}.")
+                with metrics_col:
+                    show_sort_metrics(sort_stats, getattr(history, 'steps', 0))
+                    if stored is None and algorithm in ALGORITHMS:
+                        st.download_button("Download trace file", on_click='ignore',
+                                           data=lambda: export_trace_file(algorithm, arr, order_choice),
+                                           file_name=f"{algorithm.lower().replace(' ', '_')}_{order_choice.lower()}{TRACE_EXTENSION}",
+                                           mime="application/octet-stream")
+                    st.download_button("Download GIF", on_click='ignore',
+                                       data=lambda: animation_bytes(history, colors, 'GIF'),
+                                       file_name=f"{algorithm.lower().replace(' ', '_')}_{order_choice.lower()}.gif",
+                                       mime="image/gif")
+                    if ffmpeg_available():
+                        st.download_button("Download MP4", on_click='ignore',
+                                           data=lambda: animation_bytes(history, colors, 'MP4'),
+                                           file_name=f"{algorithm.lower().replace(' ', '_')}_{order_choice.lower()}.mp4",
+                                           mime="video/mp4")
+
+            cache_stats = cache.stats()
+            st.caption(
+                f"Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['entries']} entries, "
+                f"{cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MiB, "
+                f"{cache_stats['evictions']} evictions"
+            )
+
+    elif playback_key is not None and st.session_state.get('playback', (None,))[0] == playback_key:
+        show_playback()
+
+    if race_mode and arr and st.session_state.get('race', (None, None))[0] == race_key:
+        show_race(st.session_state.race[1], arr, order_choice, show_steps)
@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# --- App Start-up / Rerun Latency (headless, via Streamlit's AppTest) ---
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+PAGES = {
+    'home': "Home Page",
+    'details': "Details",
+    'visualization': "Visualization",
+}
+HEAVY_MODULES = ('numpy', 'matplotlib', 'PIL')
+
+
+def measure_page(page, reruns, app_path=APP_PATH):
+    # One fresh interpreter per call (see run_page): the first run includes
+    # every import the page triggers, later runs are plain reruns.
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter() - start
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.session_state.page = PAGES[page]
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].value}")
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    return {
+        'page': page,
+        'streamlit_import_s': imported,
+        'cold_run_s': cold,
+        'rerun_median_s': statistics.median(times) if times else None,
+        'rerun_min_s': min(times) if times else None,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+
+def run_page(page, reruns, app_path=APP_PATH):
+    # The app resolves pics/ relative to the working directory
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', page,
+                             '--reruns', str(reruns), '--app', app_path],
+                            cwd=os.path.dirname(app_path), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def format_row(row):
+    rerun = f"{row['rerun_median_s'] * 1000:8.1f} ms" if row['rerun_median_s'] is not None else f"{'-':>11}"
+    return (f"{row['page']:<14} import {row['streamlit_import_s'] * 1000:7.1f} ms   "
+            f"cold run {row['cold_run_s'] * 1000:8.1f} ms   rerun {rerun}   "
+            f"loaded: {', '.join(row['heavy_modules']) or '-'}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start and rerun latency of the Streamlit app per page.")
+    parser.add_argument('--pages', nargs='+', default=list(PAGES), choices=list(PAGES))
+    parser.add_argument('--reruns', type=int, default=10, help="reruns timed after the first (cold) run")
+    parser.add_argument('--app', default=APP_PATH)
+    parser.add_argument('--label', default='', help="version label stored in the JSON metadata")
+    parser.add_argument('--json', help="write results to this JSON file")
+    parser.add_argument('--child', choices=list(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_page(args.child, args.reruns, args.app)))
+        return 0
+    results = []
+    for page in args.pages:
+        row = run_page(page, args.reruns, args.app)
+        print(format_row(row), flush=True)
+        results.append(row)
+    if args.json:
+        metadata = {'label': args.label, 'python': platform.python_version(), 'platform': platform.platform(),
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'reruns': args.reruns}
+        with open(args.json, 'w') as f:
+            json.dump({'metadata': metadata, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import argparse
+import csv
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from sorting import ALGORITHMS, NullTrace, SortStats, SortTrace
+
+# --- Input Distributions ---
+def random_input(n, rng):
+    return [rng.randint(-n, n) for _ in range(n)]
+
+def sorted_input(n, rng):
+    return sorted(random_input(n, rng))
+
+def reverse_sorted_input(n, rng):
+    return sorted(random_input(n, rng), reverse=True)
+
+def few_unique_input(n, rng):
+    return [rng.randint(0, 9) for _ in range(n)]
+
+def nearly_sorted_input(n, rng):
+    arr = sorted_input(n, rng)
+    for _ in range(max(1, n // 100)):
+        i, j = rng.randrange(n), rng.randrange(n)
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+def file_input(path, raw_dtype='int64'):
+    # Values from a data file (memory-mapped); size n takes the first n values
+    from ingest import load_file
+    values = load_file(path, path, raw_dtype)
+    return lambda n, rng: values[:n].tolist(), len(values)
+
+DISTRIBUTIONS = {
+    'random': random_input,
+    'sorted': sorted_input,
+    'reverse-sorted': reverse_sorted_input,
+    'few-unique': few_unique_input,
+    'nearly-sorted': nearly_sorted_input,
+}
+
+MODES = {
+    'trace': SortTrace,
+    'notrace': NullTrace,
+}
+
+FIELDS = ['algorithm', 'distribution', 'mode', 'size', 'seconds', 'peak_bytes', 'steps',
+          'comparisons', 'swaps', 'writes', 'max_depth', 'error']
+
+
+# --- Benchmark Runner ---
+def run_once(algorithm, arr, order, mode):
+    trace = MODES[mode](arr)
+    stats = SortStats()
+    start = time.perf_counter()
+    ALGORITHMS[algorithm](arr, order, trace, stats)
+    return time.perf_counter() - start, trace, stats
+
+def measure_peak(algorithm, arr, order, mode):
+    tracemalloc.start()
+    try:
+        run_once(algorithm, arr, order, mode)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_case(algorithm, distribution, mode, size, order='ASC', repeat=1, seed=0, memory=True):
+    arr = DISTRIBUTIONS[distribution](size, random.Random(seed))
+    row = {f: None for f in FIELDS}
+    row.update(algorithm=algorithm, distribution=distribution, mode=mode, size=size)
+    try:
+        best = None
+        for _ in range(repeat):
+            seconds, trace, stats = run_once(algorithm, arr, order, mode)
+            best = seconds if best is None else min(best, seconds)
+        row['seconds'] = best
+        row['steps'] = trace.steps
+        row.update((k, v) for k, v in stats.as_dict().items() if k in FIELDS)
+        if memory:
+            row['peak_bytes'] = measure_peak(algorithm, arr, order, mode)
+    except (RecursionError, MemoryError) as e:
+        row['error'] = type(e).__name__
+    except (ValueError, OverflowError) as e:
+        # e.g. Counting beyond its value range limit, or values outside int64
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+def run_suite(algorithms, distributions, modes, sizes, order='ASC', repeat=1, seed=0,
+              memory=True, budget=10.0, progress=None):
+    results = []
+    for algorithm in algorithms:
+        for distribution in distributions:
+            for mode in modes:
+                skip = False
+                for size in sorted(sizes):
+                    if skip:
+                        row = {f: None for f in FIELDS}
+                        row.update(algorithm=algorithm, distribution=distribution, mode=mode,
+                                   size=size, error='skipped (smaller size failed or over budget)')
+                    else:
+                        row = run_case(algorithm, distribution, mode, size, order, repeat, seed, memory)
+                        # Larger sizes of the same case can only get slower (or fail again)
+                        skip = row['error'] is not None or row['seconds'] > budget
+                    results.append(row)
+                    if progress:
+                        progress(row)
+    return results
+
+
+# --- Reporting ---
+def format_row(row):
+    if row['error']:
+        return f"{row['algorithm']:<10} {row['distribution']:<15} {row['mode']:<8} {row['size']:>8}  {row['error']}"
+    peak = f"{row['peak_bytes'] / 2**20:10.2f} MiB" if row['peak_bytes'] is not None else ' ' * 14
+    return (f"{row['algorithm']:<10} {row['distribution']:<15} {row['mode']:<8} {row['size']:>8} "
+            f"{row['seconds']:10.4f} s {peak} {row['steps']:>12} steps {row['comparisons']:>12} cmp")
+
+def write_json(path, results, metadata):
+    with open(path, 'w') as f:
+        json.dump({'metadata': metadata, 'results': results}, f, indent=2)
+
+def write_csv(path, results):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting engines outside of Streamlit.")
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--distributions', nargs='+', default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES),
+                        help="'trace' records every operation, 'notrace' only counts steps")
+    parser.add_argument('--input', help="benchmark on values from this .txt/.csv/.npy/.bin file instead")
+    parser.add_argument('--raw-dtype', default='int64', help="element type of a raw .bin --input file")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000, 10000, 100000, 1000000])
+    parser.add_argument('--order', default='ASC', choices=['ASC', 'DESC'])
+    parser.add_argument('--repeat', type=int, default=1, help="timed runs per case (best is reported)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help="skip larger sizes of a case once one run takes longer than this many seconds")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory run")
+    parser.add_argument('--label', default='', help="version label stored in the JSON metadata")
+    parser.add_argument('--json', help="write results to this JSON file")
+    parser.add_argument('--csv', help="write results to this CSV file")
+    args = parser.parse_args(argv)
+    if args.input:
+        DISTRIBUTIONS['file'], length = file_input(args.input, args.raw_dtype)
+        args.distributions = ['file']
+        args.sizes = sorted({min(size, length) for size in args.sizes})
+
+    metadata = {
+        'label': args.label,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'order': args.order,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'input': args.input,
+    }
+    results = run_suite(args.algorithms, args.distributions, args.modes, args.sizes, args.order,
+                        args.repeat, args.seed, not args.no_memory, args.budget,
+                        progress=lambda row: print(format_row(row), flush=True))
+    if args.json:
+        write_json(args.json, results, metadata)
+    if args.csv:
+        write_csv(args.csv, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import numpy as np
+
+from parallel_sort import sample_sort
+from sorting import COUNTING_RANGE_LIMIT
+
+# --- NumPy-vectorized integer sorts (non-visual path, no step trace) ---
+def as_int_array(values):
+    a = np.asarray(values)
+    if a.dtype.kind not in 'iu':
+        a = a.astype(np.int64)
+    return a
+
+def counting_sort(values, order='ASC'):
+    a = as_int_array(values)
+    if a.size == 0:
+        return a.copy()
+    low, high = int(a.min()), int(a.max())
+    if high - low + 1 > COUNTING_RANGE_LIMIT:
+        raise ValueError(f"Value range {high - low + 1} is too large for Counting Sort "
+                         f"(limit {COUNTING_RANGE_LIMIT}); use Radix Sort instead.")
+    # Offsets are taken in a 64-bit type: in int8/int16 `a - low` would wrap
+    if a.dtype.kind == 'u':
+        offsets = a.astype(np.uint64) - np.uint64(low)
+    else:
+        offsets = a.astype(np.int64) - low
+    counts = np.bincount(offsets.astype(np.intp), minlength=high - low + 1)
+    out = np.repeat(np.arange(low, high + 1, dtype=a.dtype), counts)
+    return out if order == 'ASC' else out[::-1]
+
+def radix_sort(values, order='ASC'):
+    a = as_int_array(values)
+    if a.size == 0:
+        return a.copy()
+    # Offsetting by the minimum (in uint64) handles negative numbers
+    low = a.min()
+    keys = a.astype(np.int64).view(np.uint64) - np.int64(low).view(np.uint64)
+    if order == 'DESC':
+        keys = keys.max() - keys
+    max_key = int(keys.max())
+    perm = np.arange(a.size)
+    shift = 0
+    while shift == 0 or (max_key >> shift) > 0:
+        digits = ((keys >> np.uint64(shift)) & np.uint64(0xFF)).astype(np.uint8)
+        # A stable argsort of uint8 digits is a single counting/radix pass in NumPy
+        step = np.argsort(digits, kind='stable')
+        keys = keys[step]
+        perm = perm[step]
+        shift += 8
+        if shift >= 64:
+            break
+    return a[perm]
+
+FAST_SORTS = {
+    'Counting': counting_sort,
+    'Radix': radix_sort,
+    'Parallel Sample': sample_sort,
+}
+
+# Engines that take a process pool (pool=...) and have no step-traced version
+POOLED_SORTS = {'Parallel Sample'}
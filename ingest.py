@@ -0,0 +1,154 @@
+import io
+import os
+
+import numpy as np
+
+# --- Bulk Input Ingestion (vectorized text parsing, .npy / raw binary loading) ---
+SEPARATOR, DIGIT, SIGN, OTHER = 0, 1, 2, 3
+MAX_DIGITS = 18
+BLOCK_BYTES = 8 * 1024 * 1024
+MAX_REPORTED = 10
+RAW_EXTENSIONS = ('.bin', '.raw', '.dat')
+
+# Byte -> character class lookup table
+CHAR_CLASS = np.full(256, OTHER, dtype=np.uint8)
+CHAR_CLASS[[ord(c) for c in ' \t\r\n,;']] = SEPARATOR
+CHAR_CLASS[ord('0'):ord('9') + 1] = DIGIT
+CHAR_CLASS[[ord('-'), ord('+')]] = SIGN
+
+
+class IngestError(ValueError):
+    def __init__(self, message, bad_tokens=()):
+        super().__init__(message)
+        self.bad_tokens = list(bad_tokens)
+
+
+def _parse_block(buf, first_token):
+    # buf is a uint8 view of text that starts and ends on token boundaries
+    cls = CHAR_CLASS[buf]
+    edges = np.diff((cls != SEPARATOR).view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return np.empty(0, dtype=np.int64), []
+
+    signed = cls[starts] == SIGN
+    first_digit = starts + signed
+    num_digits = ends - first_digit
+    bad = (num_digits <= 0) | (num_digits > MAX_DIGITS)
+    # Anything but digits is only allowed as a leading sign
+    odd = np.flatnonzero(cls >= SIGN)
+    odd = odd[(cls[odd] == OTHER) | (edges[odd] != 1)]
+    bad[np.searchsorted(starts, odd, side='right') - 1] = True
+
+    # Horner's rule one digit column at a time: at most MAX_DIGITS passes over
+    # the token arrays instead of per-character Python work
+    values = np.zeros(starts.size, dtype=np.int64)
+    last = buf.size - 1
+    for k in range(int(min(num_digits.max(), MAX_DIGITS))):
+        digit = buf[np.minimum(first_digit + k, last)].astype(np.int64) - ord('0')
+        values = np.where(num_digits > k, values * 10 + digit, values)
+    values[signed & (buf[starts] == ord('-'))] *= -1
+
+    reported = []
+    if bad.any():
+        for t in np.flatnonzero(bad)[:MAX_REPORTED].tolist():
+            reported.append((first_token + t, bytes(buf[starts[t]:ends[t]]).decode(errors='replace')))
+        reported.append(int(bad.sum()))
+    return values, reported
+
+def parse_buffer(buf, block_bytes=BLOCK_BYTES):
+    # Parses comma/whitespace separated integers from a uint8 buffer (which may be
+    # a memory map) in fixed-size blocks, so temporary arrays stay bounded.
+    buf = np.asarray(buf, dtype=np.uint8).reshape(-1)
+    parts, bad_tokens, bad_count = [], [], 0
+    pos, tokens = 0, 0
+    while pos < buf.size:
+        end = min(pos + block_bytes, buf.size)
+        if end < buf.size:
+            # Move the block end back to just after the last separator
+            seps = np.flatnonzero(CHAR_CLASS[buf[pos:end]] == SEPARATOR)
+            if seps.size:
+                end = pos + int(seps[-1]) + 1
+            else:
+                following = np.flatnonzero(CHAR_CLASS[buf[end:]] == SEPARATOR)
+                end = end + int(following[0]) + 1 if following.size else buf.size
+        values, reported = _parse_block(buf[pos:end], tokens)
+        if reported:
+            bad_count += reported.pop()
+            bad_tokens.extend(reported)
+        parts.append(values)
+        tokens += values.size
+        pos = end
+    if bad_count:
+        shown = ', '.join(f"#{i + 1} {t!r}" for i, t in bad_tokens[:MAX_REPORTED])
+        raise IngestError(f"{bad_count} invalid token(s) (expected integers of at most {MAX_DIGITS} digits): {shown}"
+                          + (" ..." if bad_count > MAX_REPORTED else ""), bad_tokens)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+def parse_text(text):
+    data = text.encode() if isinstance(text, str) else text
+    return parse_buffer(np.frombuffer(data, dtype=np.uint8))
+
+def _is_integer_token(token):
+    digits = token[1:] if token[:1] in (b'-', b'+') else token
+    return 0 < len(digits) <= MAX_DIGITS and digits.isdigit()
+
+def _skip_header(buf):
+    # Drops the first line only when none of its tokens is an integer (a CSV
+    # column header); a data line with bad tokens is parsed and reported.
+    newline = np.flatnonzero(buf[:BLOCK_BYTES] == ord('\n'))
+    first = bytes(buf[:newline[0]] if newline.size else buf[:BLOCK_BYTES])
+    tokens = first.replace(b',', b' ').replace(b';', b' ').split()
+    if tokens and not any(_is_integer_token(t) for t in tokens):
+        return buf[len(first) + 1:]
+    return buf
+
+def load_text(source, skip_header=True):
+    # source: a file path (memory-mapped) or bytes-like upload contents
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.getsize(source) == 0:
+            return np.empty(0, dtype=np.int64)
+        buf = np.memmap(source, dtype=np.uint8, mode='r')
+    else:
+        buf = np.frombuffer(source, dtype=np.uint8)
+    return parse_buffer(_skip_header(buf) if skip_header else buf)
+
+def _check_integers(values, what):
+    if values.dtype.kind not in 'iu':
+        raise IngestError(f"{what} has dtype {values.dtype}; only integer arrays can be sorted.")
+    values = values.reshape(-1)
+    # Traces store int64, so uint64 values above its maximum cannot be sorted
+    if values.dtype == np.uint64 and values.size and values.max() > np.iinfo(np.int64).max:
+        raise IngestError(f"{what} has values above {np.iinfo(np.int64).max}; "
+                          "only values that fit in int64 can be sorted.")
+    return values
+
+def load_npy(source):
+    if isinstance(source, (str, os.PathLike)):
+        values = np.load(source, mmap_mode='r', allow_pickle=False)
+    else:
+        values = np.load(io.BytesIO(source), allow_pickle=False)
+    return _check_integers(values, "The .npy array")
+
+def load_raw(source, dtype='int64'):
+    dtype = np.dtype(dtype)
+    if isinstance(source, (str, os.PathLike)):
+        size = os.path.getsize(source)
+        if size % dtype.itemsize:
+            raise IngestError(f"File size {size} is not a multiple of the {dtype} item size {dtype.itemsize}.")
+        values = np.memmap(source, dtype=dtype, mode='r') if size else np.empty(0, dtype=dtype)
+    else:
+        if len(source) % dtype.itemsize:
+            raise IngestError(f"Data size {len(source)} is not a multiple of the {dtype} item size {dtype.itemsize}.")
+        values = np.frombuffer(source, dtype=dtype)
+    return _check_integers(values, "The raw binary data")
+
+def load_file(name, source, raw_dtype='int64'):
+    # Dispatch on extension: .npy, raw binary (.bin/.raw/.dat) or CSV/text
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext == '.npy':
+        return load_npy(source)
+    if ext in RAW_EXTENSIONS:
+        return load_raw(source, raw_dtype)
+    return load_text(source)
@@ -0,0 +1,325 @@
+import argparse
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sorting import NullTrace, run_sort
+
+# --- Lexer ---
+class LexerError(Exception):
+    pass
+
+class ParserError(Exception):
+    pass
+
+class ExecutionError(Exception):
+    pass
+
+
+class Token:
+    __slots__ = ('type', 'value', 'position')
+
+    def __init__(self, type, value, position):
+        self.type = type
+        self.value = value
+        self.position = position
+
+    def __repr__(self):
+        return f"Token({self.type}, {self.value!r}, {self.position})"
+
+
+KEYWORDS = {'SORT', 'BY', 'ASC', 'DESC', 'PRINT'}
+
+# Language keyword -> engine name in sorting.ALGORITHMS
+ALGORITHM_KEYWORDS = {
+    'BUBBLE': 'Bubble',
+    'INSERTION': 'Insertion',
+    'QUICK': 'Quick',
+    'MERGE': 'Merge',
+    'INTROSORT': 'Introsort',
+    'NATURAL_MERGE': 'Natural Merge',
+    'COUNTING': 'Counting',
+    'RADIX': 'Radix',
+}
+
+
+class Lexer:
+    token_specification = [
+        ('NUMBER', r'\d+'),
+        ('WORD', r'[A-Z_]+'),
+        ('LBRACKET', r'\['),
+        ('RBRACKET', r'\]'),
+        ('COMMA', r','),
+        ('MINUS', r'-'),
+        ('COMMENT', r'#[^\n]*'),
+        ('SKIP', r'[ \t\r]+'),
+        ('MISMATCH', r'.'),
+    ]
+    # One compiled master regex; the matching group name is the token type
+    master_pattern = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification))
+
+    def __init__(self, text):
+        self.text = text
+
+    def tokens(self):
+        for match in self.master_pattern.finditer(self.text):
+            kind = match.lastgroup
+            value = match.group()
+            if kind == 'NUMBER':
+                yield Token('NUMBER', int(value), match.start())
+            elif kind == 'WORD':
+                if value in KEYWORDS:
+                    yield Token(value, value, match.start())
+                elif value in ALGORITHM_KEYWORDS:
+                    yield Token('ALGORITHM', value, match.start())
+                else:
+                    raise LexerError(f"Unknown word {value!r} at position {match.start()}")
+            elif kind == 'MISMATCH':
+                raise LexerError(f"Invalid character {value!r} at position {match.start()}")
+            elif kind not in ('SKIP', 'COMMENT'):
+                yield Token(kind, value, match.start())
+
+    def tokenize(self):
+        return list(self.tokens())
+
+
+# --- Parser ---
+class Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.current_token = self.tokens[self.pos] if tokens else None
+
+    def advance(self):
+        self.pos += 1
+        self.current_token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def expect(self, type, what=None):
+        token = self.current_token
+        if token is None or token.type != type:
+            found = 'end of command' if token is None else repr(token.value)
+            raise ParserError(f"Expected {what or type} but found {found}"
+                              + (f" at position {token.position}" if token is not None else ""))
+        self.advance()
+        return token
+
+    def parse(self):
+        if self.current_token is None:
+            return None
+        if self.current_token.type == 'SORT':
+            command = self.parse_sort_command()
+        elif self.current_token.type == 'PRINT':
+            self.advance()
+            command = {'command': 'PRINT'}
+        else:
+            raise ParserError(f"Expected SORT or PRINT but found {self.current_token.value!r} "
+                              f"at position {self.current_token.position}")
+        if self.current_token is not None:
+            raise ParserError(f"Unexpected {self.current_token.value!r} at position {self.current_token.position}")
+        return command
+
+    def parse_sort_command(self):
+        self.expect('SORT')
+        self.expect('LBRACKET', "'['")
+        array = []
+        if self.current_token is not None and self.current_token.type != 'RBRACKET':
+            array.append(self.parse_number())
+            while self.current_token is not None and self.current_token.type == 'COMMA':
+                self.advance()
+                array.append(self.parse_number())
+        self.expect('RBRACKET', "',' or ']'")
+        algorithm = self.expect('ALGORITHM', "an algorithm name").value
+        self.expect('BY')
+        if self.current_token is None or self.current_token.type not in ('ASC', 'DESC'):
+            raise ParserError("Expected ASC or DESC after BY")
+        order = self.current_token.type
+        self.advance()
+        return {'command': 'SORT', 'array': array, 'algorithm': algorithm, 'order': order}
+
+    def parse_number(self):
+        sign = 1
+        if self.current_token is not None and self.current_token.type == 'MINUS':
+            sign = -1
+            self.advance()
+        return sign * self.expect('NUMBER', "a number").value
+
+
+def parse_line(line):
+    return Parser(Lexer(line).tokenize()).parse()
+
+def parse_script(lines, keep_going=False, errors=None):
+    # Streams (line number, command) pairs so arbitrarily long scripts are
+    # consumed one line at a time. Blank and comment-only lines are skipped.
+    for line_no, line in enumerate(lines, 1):
+        try:
+            command = parse_line(line)
+        except (LexerError, ParserError) as e:
+            error = type(e)(f"line {line_no}: {e}")
+            if not keep_going:
+                raise error from e
+            if errors is not None:
+                errors.append(error)
+            continue
+        if command is not None:
+            yield line_no, command
+
+
+# --- Executor ---
+class Executor:
+    def __init__(self, record=False):
+        self.record = record
+        self.last_sorted_array = []
+        self.last_trace = None
+
+    def execute(self, command):
+        if command['command'] == 'SORT':
+            sorted_array = self.sort_array(
+                command['array'],
+                command['algorithm'],
+                command['order']
+            )
+            self.last_sorted_array = sorted_array
+            return sorted_array
+        if command['command'] == 'PRINT':
+            return self.last_sorted_array
+        raise ExecutionError(f"Unknown command {command['command']!r}")
+
+    def sort_array(self, array, algorithm, order):
+        name = ALGORITHM_KEYWORDS[algorithm]
+        trace = None if self.record else NullTrace(array)
+        try:
+            trace = run_sort(name, array, order, trace)
+        except (ValueError, RecursionError, OverflowError) as e:
+            # OverflowError: recording traces store values as int64
+            raise ExecutionError(f"{algorithm} failed: {e}") from e
+        if self.record:
+            self.last_trace = trace
+        return trace.result
+
+    def run_script(self, lines, keep_going=False, errors=None):
+        # Yields (line number, command, result) for every executed command
+        for line_no, command in parse_script(lines, keep_going, errors):
+            try:
+                result = self.execute(command)
+            except ExecutionError as e:
+                error = ExecutionError(f"line {line_no}: {e}")
+                if not keep_going:
+                    raise error from e
+                if errors is not None:
+                    errors.append(error)
+                continue
+            yield line_no, command, result
+
+
+# --- Parallel Batch Executor ---
+ERRORS = {cls.__name__: cls for cls in (LexerError, ParserError, ExecutionError)}
+
+def _run_chunk(numbered_lines):
+    # Runs in a worker process: lexes, parses and sorts a chunk of raw lines.
+    # PRINT is only marked here; it is resolved in script order by the parent.
+    # Errors are returned rather than raised so one bad line does not discard
+    # the rest of its chunk.
+    executor = Executor()
+    results = []
+    for line_no, line in numbered_lines:
+        try:
+            command = parse_line(line)
+            if command is None:
+                continue
+            if command['command'] == 'PRINT':
+                results.append((line_no, command, None, None))
+            else:
+                results.append((line_no, command, executor.execute(command), None))
+        except (LexerError, ParserError, ExecutionError) as e:
+            results.append((line_no, None, None, (type(e).__name__, str(e))))
+    return results
+
+
+class BatchExecutor:
+    # Chunks of script lines are dispatched to a process pool. Results are
+    # yielded in script order as soon as the oldest in-flight chunk finishes,
+    # which keeps PRINT semantics identical to the sequential Executor.
+    def __init__(self, max_workers=None, chunk_size=256, max_in_flight=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.last_sorted_array = []
+
+    def chunks(self, lines):
+        chunk = []
+        for line_no, line in enumerate(lines, 1):
+            chunk.append((line_no, line))
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def drain(self, future, keep_going, errors):
+        for line_no, command, result, failure in future.result():
+            if failure is not None:
+                error = ERRORS[failure[0]](f"line {line_no}: {failure[1]}")
+                if not keep_going:
+                    raise error
+                if errors is not None:
+                    errors.append(error)
+            elif command['command'] == 'PRINT':
+                yield line_no, command, self.last_sorted_array
+            else:
+                self.last_sorted_array = result
+                yield line_no, command, result
+
+    def run_script(self, lines, keep_going=False, errors=None):
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                for chunk in self.chunks(lines):
+                    in_flight.append(pool.submit(_run_chunk, chunk))
+                    if len(in_flight) >= self.max_in_flight:
+                        yield from self.drain(in_flight.popleft(), keep_going, errors)
+                while in_flight:
+                    yield from self.drain(in_flight.popleft(), keep_going, errors)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+
+def format_array(array):
+    return '[' + ', '.join(map(str, array)) + ']'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a SORT/PRINT command script.")
+    parser.add_argument('script', help="script file to execute ('-' reads standard input)")
+    parser.add_argument('--trace', action='store_true', help="record full step traces while sorting")
+    parser.add_argument('--echo', action='store_true', help="also print the result of every SORT command")
+    parser.add_argument('--keep-going', action='store_true', help="report bad lines and continue")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="worker processes for SORT commands (0 = all cores, 1 = sequential)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="script lines per worker task")
+    args = parser.parse_args(argv)
+
+    if args.jobs != 1 and args.trace:
+        parser.error("--trace cannot be combined with parallel --jobs")
+    if args.jobs == 1:
+        executor = Executor(record=args.trace)
+    else:
+        executor = BatchExecutor(max_workers=args.jobs or None, chunk_size=args.chunk_size)
+    errors = []
+    source = sys.stdin if args.script == '-' else open(args.script)
+    try:
+        with source:
+            for line_no, command, result in executor.run_script(source, args.keep_going, errors):
+                if command['command'] == 'PRINT' or args.echo:
+                    print(format_array(result))
+    except (LexerError, ParserError, ExecutionError) as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    for error in errors:
+        print(f"{type(error).__name__}: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# --- Parallel Sample Sort (process pool over shared memory, non-visual path) ---
+PARALLEL_MIN_SIZE = 1 << 16
+OVERSAMPLE = 64
+
+
+def _attach(name, n, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+
+def _sort_chunk(name, n, dtype, start, stop, splitters):
+    # Sorts src[start:stop] in place and returns where each bucket begins
+    shm, src = _attach(name, n, dtype)
+    try:
+        chunk = src[start:stop]
+        chunk.sort()
+        return [start] + (start + np.searchsorted(chunk, splitters, side='right')).tolist() + [stop]
+    finally:
+        del src, chunk
+        shm.close()
+
+def _merge_bucket(src_name, dst_name, n, dtype, pieces, offset):
+    # Copies one bucket's sorted run from every chunk into its final place
+    # and merges them (NumPy's stable sort is a run-merging timsort for int64)
+    src_shm, src = _attach(src_name, n, dtype)
+    dst_shm, dst = _attach(dst_name, n, dtype)
+    try:
+        pos = offset
+        for lo, hi in pieces:
+            dst[pos:pos + hi - lo] = src[lo:hi]
+            pos += hi - lo
+        dst[offset:pos].sort(kind='stable')
+    finally:
+        del src, dst
+        src_shm.close()
+        dst_shm.close()
+
+def choose_splitters(a, buckets, seed=0):
+    sample = np.sort(np.random.default_rng(seed).choice(a, size=min(a.size, buckets * OVERSAMPLE)))
+    return sample[np.arange(1, buckets) * sample.size // buckets]
+
+def sample_sort(values, order='ASC', pool=None, workers=None):
+    # The array lives in shared memory: workers only receive block names and
+    # index ranges. Phase 1 sorts equal chunks and splits each into buckets
+    # at common splitters; phase 2 assembles and merges every bucket.
+    a = np.asarray(values)
+    if a.dtype.kind not in 'iu':
+        a = a.astype(np.int64)
+    if pool is None or a.size < PARALLEL_MIN_SIZE:
+        out = np.sort(a)
+        return out if order == 'ASC' else out[::-1]
+
+    n, dtype = a.size, a.dtype.str
+    workers = workers or os.cpu_count() or 1
+    splitters = choose_splitters(a, workers)
+    src = shared_memory.SharedMemory(create=True, size=a.nbytes)
+    dst = shared_memory.SharedMemory(create=True, size=a.nbytes)
+    try:
+        view = np.ndarray((n,), dtype=dtype, buffer=src.buf)
+        view[:] = a
+        del view
+        edges = np.linspace(0, n, workers + 1).astype(np.int64).tolist()
+        bounds = [f.result() for f in [pool.submit(_sort_chunk, src.name, n, dtype, lo, hi, splitters)
+                                       for lo, hi in zip(edges, edges[1:])]]
+        sizes = [sum(b[k + 1] - b[k] for b in bounds) for k in range(workers)]
+        offsets = np.cumsum([0] + sizes).tolist()
+        for future in [pool.submit(_merge_bucket, src.name, dst.name, n, dtype,
+                                   [(b[k], b[k + 1]) for b in bounds], offsets[k])
+                       for k in range(workers) if sizes[k]]:
+            future.result()
+        view = np.ndarray((n,), dtype=dtype, buffer=dst.buf)
+        out = view.copy()
+        del view
+    finally:
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
+    return out if order == 'ASC' else out[::-1]
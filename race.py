@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+
+from sorting import ALGORITHMS, KeyframeTrace, run_sort
+
+# --- Algorithm Race (all engines on one input, concurrently) ---
+# O(n^2) engines are skipped above this size; the whole race has a deadline
+QUADRATIC_SORTS = ('Bubble', 'Insertion')
+QUADRATIC_MAX_SIZE = 2000
+RACE_TIMEOUT = 60.0
+
+def _race_one(algorithm, arr, order, keyframe_budget=None):
+    trace = KeyframeTrace(arr, budget=keyframe_budget) if keyframe_budget else None
+    start = time.perf_counter()
+    try:
+        trace = run_sort(algorithm, arr, order, trace)
+    except (ValueError, RecursionError, OverflowError) as e:
+        return algorithm, None, f"{type(e).__name__}: {e}"
+    trace.stats.timings['wall'] = time.perf_counter() - start
+    return algorithm, trace, None
+
+def run_race(arr, order, algorithms=None, keyframe_budget=None, pool=None, processes=True,
+             max_quadratic=QUADRATIC_MAX_SIZE, timeout=RACE_TIMEOUT):
+    # Returns {algorithm: (trace or None, error or None)} in registry order.
+    # Pure-Python sorts hold the GIL, so processes are the default; pass a
+    # long-lived pool to avoid paying worker start-up on every race. Engines
+    # still running at the deadline are reported as timed out.
+    algorithms = list(ALGORITHMS) if algorithms is None else algorithms
+    skipped = {name for name in algorithms if name in QUADRATIC_SORTS and len(arr) > max_quadratic}
+    running = [name for name in algorithms if name not in skipped]
+    own_pool = pool is None
+    if own_pool and running:
+        pool = (ProcessPoolExecutor if processes else ThreadPoolExecutor)(max_workers=len(running))
+    timed_out = False
+    try:
+        futures = {name: pool.submit(_race_one, name, list(arr), order, keyframe_budget) for name in running}
+        deadline = time.perf_counter() + timeout
+        results = {}
+        for name in algorithms:
+            if name in skipped:
+                results[name] = (None, f"skipped (quadratic sort, more than {max_quadratic:,} values)")
+                continue
+            try:
+                _, trace, error = futures[name].result(timeout=max(0.0, deadline - time.perf_counter()))
+            except TimeoutError:
+                futures[name].cancel()
+                timed_out = True
+                trace, error = None, f"timed out after {timeout:g} s"
+            results[name] = (trace, error)
+        return results
+    finally:
+        if own_pool and running:
+            pool.shutdown(wait=not timed_out, cancel_futures=True)
+
+def race_table(results):
+    rows = []
+    for name, (trace, error) in results.items():
+        if trace is None:
+            rows.append({'Algorithm': name, 'Wall (ms)': None, 'Steps': None, 'Comparisons': None,
+                         'Swaps': None, 'Writes': None, 'Max Depth': None, 'Status': error})
+            continue
+        stats = trace.stats
+        rows.append({
+            'Algorithm': name,
+            'Wall (ms)': round(stats.timings['wall'] * 1000, 3),
+            'Steps': trace.steps,
+            'Comparisons': stats.comparisons,
+            'Swaps': stats.swaps,
+            'Writes': stats.writes,
+            'Max Depth': stats.max_depth,
+            'Status': 'ok',
+        })
+    return rows
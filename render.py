@@ -0,0 +1,185 @@
+import numpy as np
+from matplotlib import colormaps
+from PIL import Image, ImageDraw, ImageFont
+
+# --- Fast Rasterizing Renderer (one canvas, NumPy image buffers) ---
+TILE_WIDTH = 320
+TILE_HEIGHT = 160
+TILE_HEADER = 22
+TILE_PAD = 8
+TITLE_HEIGHT = 32
+BACKGROUND = (255, 255, 255)
+MAX_GRID_FRAMES = 240
+MAX_HEATMAP_ROWS = 2000
+PLAYER_WIDTH = 960
+PLAYER_HEIGHT = 320
+DEFAULT_CMAP = 'turbo'
+COLOR_LEVELS = 256
+MAX_BINNED_LEGEND = 12
+
+
+class ValueColors:
+    # Continuous colormap over [low, high] sampled into a small RGB lookup
+    # table; mapping any number of values is one vectorized array lookup.
+    def __init__(self, low, high, cmap=DEFAULT_CMAP, levels=COLOR_LEVELS):
+        self.low = int(low)
+        self.high = int(high)
+        self.cmap = cmap
+        self.levels = levels
+        self.lut = (colormaps[cmap](np.linspace(0, 1, levels))[:, :3] * 255).astype(np.uint8)
+
+    @classmethod
+    def from_values(cls, values, cmap=DEFAULT_CMAP):
+        values = np.asarray(values)
+        if values.size == 0:
+            return cls(0, 0, cmap)
+        return cls(values.min(), values.max(), cmap)
+
+    def indices(self, values):
+        span = max(self.high - self.low, 1)
+        scaled = (np.asarray(values, dtype=np.float64) - self.low) * ((self.levels - 1) / span)
+        return np.clip(np.rint(scaled), 0, self.levels - 1).astype(np.intp)
+
+    def rgb(self, values):
+        return self.lut[self.indices(values)]
+
+
+class FramePainter:
+    # Everything that does not change between frames is computed once here:
+    # the y scale (from the color range) and the pixel -> bar mapping.
+    def __init__(self, colors, n, width=TILE_WIDTH, height=TILE_HEIGHT):
+        self.colors = colors
+        self.n = n
+        self.width = width
+        self.height = height
+        low = min(0, colors.low)
+        high = max(0, colors.high) + 1
+        self.scale = (height - 1) / (high - low)
+        self.baseline = int(round(high * self.scale))
+        self.columns = np.arange(width) * n // width
+        # Leave a 1px gap between bars when they are wide enough to show it
+        starts = np.r_[True, self.columns[1:] != self.columns[:-1]]
+        self.solid = ~starts if width >= 4 * n else np.ones(width, dtype=bool)
+        self.rows = np.arange(height)[:, None]
+        self.background = np.array(BACKGROUND, dtype=np.uint8)
+
+    def bars(self, frame):
+        # (pixel mask of the bars, value shown in each pixel column)
+        values = np.asarray(frame)[self.columns]
+        heights = np.rint(values * self.scale).astype(np.int64)
+        top = np.minimum(self.baseline - heights, self.baseline)
+        bottom = np.maximum(self.baseline - heights, self.baseline)
+        return (self.rows >= top) & (self.rows <= bottom) & ((heights != 0) & self.solid), values
+
+    def paint(self, frame, out=None):
+        out = np.empty((self.height, self.width, 3), dtype=np.uint8) if out is None else out
+        inside, values = self.bars(frame)
+        out[:] = np.where(inside[:, :, None], self.colors.rgb(values)[None, :, :], self.background)
+        return out
+
+    def paint_indices(self, frame, background_index):
+        # Palette-indexed image (colormap level per pixel) for paletted encoders
+        inside, values = self.bars(frame)
+        return np.where(inside, self.colors.indices(values)[None, :], background_index).astype(np.uint8)
+
+
+def render_frame(frame, colors, width=PLAYER_WIDTH, height=PLAYER_HEIGHT):
+    # A single frame as an RGB image, for views that show one step at a time
+    return FramePainter(colors, len(frame), width, height).paint(frame)
+
+def sample_rows(total, limit):
+    # Evenly spaced frame indices, always including the first and last frame
+    if total <= limit:
+        return list(range(total))
+    return np.unique(np.linspace(0, total - 1, limit).astype(np.int64)).tolist()
+
+def frames_array(history, rows=None):
+    # Materialize (a subset of) trace frames as one 2D int64 array, streaming
+    # through the trace once instead of indexing it frame by frame.
+    wanted = range(len(history)) if rows is None else rows
+    if hasattr(history, 'frames'):
+        # Random-access traces (trace files) rebuild just the wanted rows
+        return history.frames(wanted)
+    out = np.empty((len(wanted), len(history[0]) if len(history) else 0), dtype=np.int64)
+    targets = iter(enumerate(wanted))
+    r, target = next(targets, (None, None))
+    for idx, frame in enumerate(history):
+        while target == idx:
+            out[r] = frame
+            r, target = next(targets, (None, None))
+        if target is None:
+            break
+    return out
+
+def plot_history_grid(history, colors, order_choice, step_labels=None, ncols=3, max_frames=MAX_GRID_FRAMES):
+    rows = sample_rows(len(history), max_frames)
+    frames = frames_array(history, rows)
+    step_labels = list(range(len(history)) if step_labels is None else step_labels)
+    titles = [f"Step {step_labels[r]}" for r in rows]
+    return plot_frame_tiles(frames, titles, colors, order_choice, ncols)
+
+def plot_frame_tiles(frames, titles, colors, order_choice, ncols=3):
+    # Paints every frame into one shared canvas and labels each tile header
+    # with PIL; the result is a PIL image, encoded to PNG without matplotlib.
+    frames = np.asarray(frames)
+    nrows = (len(frames) + ncols - 1) // ncols
+    painter = FramePainter(colors, frames.shape[1])
+    tile_h = TILE_HEADER + TILE_HEIGHT + TILE_PAD
+    tile_w = TILE_WIDTH + TILE_PAD
+    canvas = np.full((TITLE_HEIGHT + nrows * tile_h, ncols * tile_w, 3), 255, dtype=np.uint8)
+    for idx, frame in enumerate(frames):
+        y = TITLE_HEIGHT + (idx // ncols) * tile_h + TILE_HEADER
+        x = (idx % ncols) * tile_w
+        painter.paint(frame, canvas[y:y + TILE_HEIGHT, x:x + TILE_WIDTH])
+    image = Image.fromarray(canvas)
+    draw = ImageDraw.Draw(image)
+    draw.text((image.width // 2, TITLE_HEIGHT // 2), f"{'Ascending' if order_choice == 'ASC' else 'Descending'} Order",
+              fill='black', font=ImageFont.load_default(18), anchor='mm')
+    font = ImageFont.load_default(13)
+    for idx, title in enumerate(titles):
+        draw.text(((idx % ncols) * tile_w + 2, TITLE_HEIGHT + (idx // ncols) * tile_h + TILE_HEADER - 4),
+                  title, fill='black', font=font, anchor='ls')
+    return image
+
+def plot_heatmap(history, colors, order_choice, step_labels=None, max_rows=MAX_HEATMAP_ROWS):
+    # Step x position image: one row per (sampled) frame, one column per element
+    total = len(history)
+    rows = sample_rows(total, max_rows)
+    frames = frames_array(history, rows)
+    image = colors.rgb(frames)
+    import matplotlib.pyplot as plt
+    step_labels = list(range(total) if step_labels is None else step_labels)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.imshow(image, aspect='auto', interpolation='nearest')
+    ticks = np.linspace(0, len(rows) - 1, min(len(rows), 8)).astype(np.int64)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels([str(step_labels[rows[t]]) for t in ticks])
+    ax.set_ylabel('Step')
+    ax.set_xlabel(f"Position ({'Ascending' if order_choice == 'ASC' else 'Descending'} Order)")
+    ax.set_title('Step x Position Heatmap', fontsize=12)
+    return fig
+
+def plot_legend_bar(colors, values=None):
+    # A binned legend (one swatch per distinct value) for low-cardinality input,
+    # otherwise a colorbar; either way the cost does not grow with input length.
+    import matplotlib.pyplot as plt
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
+    distinct = np.unique(np.asarray(values)) if values is not None else None
+    if distinct is not None and len(distinct) <= MAX_BINNED_LEGEND:
+        fig, ax = plt.subplots(figsize=(max(2, len(distinct)), 0.5))
+        ax.barh(np.zeros(len(distinct)), 1, left=np.arange(len(distinct)),
+                color=colors.rgb(distinct) / 255, edgecolor='black')
+        for i, val in enumerate(distinct.tolist()):
+            ax.text(i + 0.5, 0, str(val), ha='center', va='center', color='white', fontsize=12)
+        ax.set_yticks([])
+        ax.set_xticks([])
+        ax.set_xlim(0, len(distinct))
+        ax.set_title('Legend: Value-Color Mapping', fontsize=12)
+        ax.set_frame_on(False)
+        return fig
+    fig, ax = plt.subplots(figsize=(8, 0.6))
+    fig.colorbar(ScalarMappable(norm=Normalize(colors.low, max(colors.high, colors.low + 1)), cmap=colors.cmap),
+                 cax=ax, orientation='horizontal')
+    ax.set_title('Legend: Value-Color Mapping', fontsize=12)
+    return fig
@@ -0,0 +1,723 @@
+import operator
+import time
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+
+SMALL_RANGE = 16
+NINTHER_THRESHOLD = 40
+MIN_RUN = 8
+MIN_GALLOP = 7
+COUNTING_RANGE_LIMIT = 1 << 20
+RADIX_BASE = 10
+CHECKPOINT_MIN = 256
+
+# --- Sort Trace (initial array + operation log) ---
+SWAP = 0
+WRITE = 1
+COMPARE = 2
+
+
+class SortTrace:
+    def __init__(self, initial, compares=False, every=None):
+        self.initial = list(initial)
+        self.compares = compares
+        # Flat (kind, a, b) triples: swap i,j / write k,value / compare i,j
+        self.ops = array('q')
+        self.steps = 0
+        # Step indices at which a pass (outer loop, partition, merge level) ended
+        self.marks = array('q')
+        self.result = None
+        self.stats = None
+        # A full copy of the array every `every` steps, so reaching step k
+        # replays at most `every` operations instead of k
+        self.every = every or max(CHECKPOINT_MIN, len(self.initial))
+        self.next_checkpoint = self.every
+        self.checkpoint_steps = [0]
+        self.checkpoints = [(0, array('q', self.initial))]
+        self._work = None
+
+    def begin(self):
+        self._work = self.initial[:]
+        return self._work
+
+    def _checkpoint(self):
+        self.checkpoint_steps.append(self.steps)
+        self.checkpoints.append((len(self.ops), array('q', self._work)))
+        self.next_checkpoint = self.steps + self.every
+
+    def mark(self):
+        if not self.marks or self.marks[-1] != self.steps:
+            self.marks.append(self.steps)
+
+    def swap(self, i, j):
+        self.ops.extend((SWAP, i, j))
+        self.steps += 1
+        if self.steps >= self.next_checkpoint:
+            self._checkpoint()
+
+    def write(self, k, value):
+        self.ops.extend((WRITE, k, value))
+        self.steps += 1
+        if self.steps >= self.next_checkpoint:
+            self._checkpoint()
+
+    def compare(self, i, j):
+        if self.compares:
+            self.ops.extend((COMPARE, i, j))
+
+    def finish(self, a):
+        self.result = a
+        self._work = None
+        return self
+
+    def nbytes(self):
+        return (self.ops.itemsize * (len(self.ops) + len(self.marks)) + 8 * len(self.initial)
+                + sum(8 * len(frame) for _, frame in self.checkpoints))
+
+    def frame_steps(self):
+        return range(self.steps + 1)
+
+    def __len__(self):
+        return self.steps + 1
+
+    def __iter__(self):
+        a = self.initial[:]
+        yield a[:]
+        ops = self.ops
+        for p in range(0, len(ops), 3):
+            kind, x, y = ops[p], ops[p + 1], ops[p + 2]
+            if kind == SWAP:
+                a[x], a[y] = a[y], a[x]
+            elif kind == WRITE:
+                a[x] = y
+            else:
+                continue
+            yield a[:]
+
+    def __getitem__(self, step):
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError("trace step out of range")
+        c = bisect_right(self.checkpoint_steps, step) - 1
+        p, frame = self.checkpoints[c]
+        a = frame.tolist()
+        step -= self.checkpoint_steps[c]
+        ops = self.ops
+        while step:
+            kind, x, y = ops[p], ops[p + 1], ops[p + 2]
+            if kind == SWAP:
+                a[x], a[y] = a[y], a[x]
+                step -= 1
+            elif kind == WRITE:
+                a[x] = y
+                step -= 1
+            p += 3
+        return a
+
+    def at_step(self, step):
+        # Array state after `step` operations, holding the final state past the end
+        return self[min(max(step, 0), self.steps)]
+
+
+class NullTrace(SortTrace):
+    # Counts steps without recording operations (timing / non-visual runs).
+    # It never replays frames, so no int64 checkpoint of the input is taken.
+    def __init__(self, initial):
+        self.initial = list(initial)
+        self.compares = False
+        self.ops = array('q')
+        self.steps = 0
+        self.marks = array('q')
+        self.result = None
+        self.stats = None
+        self.checkpoint_steps = []
+        self.checkpoints = []
+        self._work = None
+
+    def swap(self, i, j):
+        self.steps += 1
+
+    def write(self, k, value):
+        self.steps += 1
+
+    def compare(self, i, j):
+        pass
+
+    def __iter__(self):
+        raise TypeError("NullTrace does not record frames")
+
+    def __getitem__(self, step):
+        raise TypeError("NullTrace does not record frames")
+
+
+class KeyframeTrace(SortTrace):
+    # Keeps full snapshots of only every `stride`-th step plus pass boundaries.
+    # With a budget the stride adapts: once the budget is exceeded every other
+    # keyframe is dropped and the stride doubles, so memory stays bounded.
+    def __init__(self, initial, every=None, budget=60, max_bytes=64 * 1024 * 1024):
+        super().__init__(initial)
+        self.budget = max(2, min(budget, max_bytes // max(1, 8 * len(self.initial))))
+        self.adaptive = every is None
+        # Adaptive mode starts from an n log n estimate of the step count
+        n = len(self.initial)
+        self.stride = every or max(1, n * n.bit_length() // self.budget)
+        self.next_step = self.stride
+        self.keyframes = [(0, array('q', self.initial))]
+
+    def _snapshot(self):
+        self.keyframes.append((self.steps, array('q', self._work)))
+        self.next_step = self.steps + self.stride
+        if self.adaptive and len(self.keyframes) > self.budget:
+            self.keyframes = self.keyframes[::2]
+            self.stride *= 2
+            self.next_step = self.keyframes[-1][0] + self.stride
+
+    def swap(self, i, j):
+        self.steps += 1
+        if self.steps >= self.next_step:
+            self._snapshot()
+
+    def write(self, k, value):
+        self.steps += 1
+        if self.steps >= self.next_step:
+            self._snapshot()
+
+    def compare(self, i, j):
+        pass
+
+    def mark(self):
+        super().mark()
+        # Pass boundaries are kept too, as long as they are not denser than half a stride
+        if self.steps - self.keyframes[-1][0] >= max(1, self.stride // 2):
+            self._snapshot()
+
+    def finish(self, a):
+        if self.keyframes[-1][0] != self.steps:
+            self.keyframes.append((self.steps, array('q', a)))
+        return super().finish(a)
+
+    def nbytes(self):
+        return super().nbytes() + sum(8 * len(frame) for _, frame in self.keyframes)
+
+    def frame_steps(self):
+        return [step for step, _ in self.keyframes]
+
+    def __len__(self):
+        return len(self.keyframes)
+
+    def __iter__(self):
+        for _, frame in self.keyframes:
+            yield frame.tolist()
+
+    def __getitem__(self, index):
+        return self.keyframes[index][1].tolist()
+
+    def at_step(self, step):
+        # Nearest keyframe at or before `step`
+        return self[max(0, bisect_right(self.frame_steps(), step) - 1)]
+
+
+# --- Instrumentation (operation counters + phase timings) ---
+class SortStats:
+    def __init__(self):
+        self.comparisons = 0
+        self.swaps = 0
+        self.writes = 0
+        self.max_depth = 0
+        self.timings = {}
+
+    def depth(self, d):
+        if d > self.max_depth:
+            self.max_depth = d
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for name in ('comparisons', 'swaps', 'writes', 'max_depth'):
+            setattr(stats, name, data.get(name, 0))
+        stats.timings = dict(data.get('timings', {}))
+        return stats
+
+    def as_dict(self):
+        return {
+            'comparisons': self.comparisons,
+            'swaps': self.swaps,
+            'writes': self.writes,
+            'max_depth': self.max_depth,
+            'timings': dict(self.timings),
+        }
+
+
+# --- Sorting Algorithms ---
+def bubble_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    arr = trace.begin()
+    n = len(arr)
+    comparisons = swaps = 0
+    for i in range(n):
+        for j in range(n - i - 1):
+            comparisons += 1
+            trace.compare(j, j + 1)
+            if (order == 'ASC' and arr[j] > arr[j + 1]) or (order == 'DESC' and arr[j] < arr[j + 1]):
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                swaps += 1
+                trace.swap(j, j + 1)
+        trace.mark()
+    stats.comparisons += comparisons
+    stats.swaps += swaps
+    stats.depth(1 if n else 0)
+    return trace.finish(arr)
+
+def insertion_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    arr = trace.begin()
+    comparisons = writes = 0
+    for i in range(1, len(arr)):
+        key = arr[i]
+        j = i - 1
+        while j >= 0:
+            comparisons += 1
+            trace.compare(j, i)
+            if not ((order == 'ASC' and arr[j] > key) or (order == 'DESC' and arr[j] < key)):
+                break
+            arr[j + 1] = arr[j]
+            writes += 1
+            trace.write(j + 1, arr[j])
+            j -= 1
+        arr[j + 1] = key
+        writes += 1
+        trace.write(j + 1, key)
+        trace.mark()
+    stats.comparisons += comparisons
+    stats.writes += writes
+    stats.depth(1 if arr else 0)
+    return trace.finish(arr)
+
+def quick_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    def _quick_sort(a, l, r, depth):
+        if l < r:
+            stats.depth(depth)
+            pi = partition(a, l, r)
+            _quick_sort(a, l, pi - 1, depth + 1)
+            _quick_sort(a, pi + 1, r, depth + 1)
+    def partition(a, l, r):
+        pivot = a[r]
+        i = l - 1
+        swaps = 0
+        for j in range(l, r):
+            trace.compare(j, r)
+            if (order == 'ASC' and a[j] < pivot) or (order == 'DESC' and a[j] > pivot):
+                i += 1
+                if i != j:
+                    a[i], a[j] = a[j], a[i]
+                    swaps += 1
+                    trace.swap(i, j)
+        if i + 1 != r:
+            a[i + 1], a[r] = a[r], a[i + 1]
+            swaps += 1
+            trace.swap(i + 1, r)
+        stats.comparisons += r - l
+        stats.swaps += swaps
+        trace.mark()
+        return i + 1
+    a = trace.begin()
+    _quick_sort(a, 0, len(a) - 1, 1)
+    return trace.finish(a)
+
+def merge_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    def _merge_sort(a, l, r, depth):
+        if l < r:
+            stats.depth(depth)
+            m = (l + r) // 2
+            _merge_sort(a, l, m, depth + 1)
+            _merge_sort(a, m + 1, r, depth + 1)
+            merge(a, l, m, r)
+    def merge(a, l, m, r):
+        left = a[l:m+1]
+        right = a[m+1:r+1]
+        i = j = 0
+        comparisons = 0
+        for k in range(l, r + 1):
+            if i < len(left) and j < len(right):
+                comparisons += 1
+            if i < len(left) and (j == len(right) or
+               ((order == 'ASC' and left[i] <= right[j]) or (order == 'DESC' and left[i] >= right[j]))):
+                a[k] = left[i]
+                i += 1
+            else:
+                a[k] = right[j]
+                j += 1
+            trace.write(k, a[k])
+        stats.comparisons += comparisons
+        stats.writes += r - l + 1
+        trace.mark()
+    a = trace.begin()
+    _merge_sort(a, 0, len(a) - 1, 1)
+    return trace.finish(a)
+
+def introsort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    before = operator.lt if order == 'ASC' else operator.gt
+    a = trace.begin()
+    n = len(a)
+
+    def swap(i, j):
+        if i != j:
+            a[i], a[j] = a[j], a[i]
+            stats.swaps += 1
+            trace.swap(i, j)
+
+    def median_of_three(i, j, k):
+        stats.comparisons += 3
+        if before(a[i], a[j]):
+            if before(a[j], a[k]):
+                return j
+            return k if before(a[i], a[k]) else i
+        if before(a[i], a[k]):
+            return i
+        return k if before(a[j], a[k]) else j
+
+    def choose_pivot(lo, hi):
+        mid = (lo + hi) // 2
+        if hi - lo + 1 > NINTHER_THRESHOLD:
+            s = (hi - lo + 1) // 8
+            return median_of_three(median_of_three(lo, lo + s, lo + 2 * s),
+                                   median_of_three(mid - s, mid, mid + s),
+                                   median_of_three(hi - 2 * s, hi - s, hi))
+        return median_of_three(lo, mid, hi)
+
+    def partition3(lo, hi):
+        # Dutch national flag: [lo, lt) before pivot, [lt, gt] equal, (gt, hi] after
+        pivot = a[choose_pivot(lo, hi)]
+        lt, i, gt = lo, lo, hi
+        while i <= gt:
+            stats.comparisons += 1
+            if before(a[i], pivot):
+                swap(lt, i)
+                lt += 1
+                i += 1
+            else:
+                stats.comparisons += 1
+                if before(pivot, a[i]):
+                    swap(i, gt)
+                    gt -= 1
+                else:
+                    i += 1
+        return lt, gt
+
+    def sift_down(lo, root, end):
+        while True:
+            child = 2 * (root - lo) + 1 + lo
+            if child > end:
+                return
+            if child + 1 <= end:
+                stats.comparisons += 1
+                if before(a[child], a[child + 1]):
+                    child += 1
+            stats.comparisons += 1
+            if not before(a[root], a[child]):
+                return
+            swap(root, child)
+            root = child
+
+    def heapsort(lo, hi):
+        for start in range((hi - lo - 1) // 2 + lo, lo - 1, -1):
+            sift_down(lo, start, hi)
+        for end in range(hi, lo, -1):
+            swap(lo, end)
+            sift_down(lo, lo, end - 1)
+
+    def small_insertion_sort(lo, hi):
+        for i in range(lo + 1, hi + 1):
+            j = i
+            while j > lo:
+                stats.comparisons += 1
+                if not before(a[j], a[j - 1]):
+                    break
+                swap(j, j - 1)
+                j -= 1
+
+    depth_limit = 2 * n.bit_length()
+    stack = [(0, n - 1, 1)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo + 1 > SMALL_RANGE:
+            stats.depth(depth)
+            if depth > depth_limit:
+                heapsort(lo, hi)
+                trace.mark()
+                break
+            lt, gt = partition3(lo, hi)
+            trace.mark()
+            depth += 1
+            # Loop on the smaller side, defer the larger one: the stack stays O(log n)
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        else:
+            if hi > lo:
+                stats.depth(depth)
+                small_insertion_sort(lo, hi)
+                trace.mark()
+    return trace.finish(a)
+
+def natural_merge_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    before = operator.lt if order == 'ASC' else operator.gt
+    a = trace.begin()
+    n = len(a)
+    buf = [None] * n
+
+    def put(k, value):
+        a[k] = value
+        stats.writes += 1
+        trace.write(k, value)
+
+    def gallop_left(key, seq, lo, hi):
+        # First index in seq[lo:hi] whose element is not before key
+        step, last = 1, lo
+        while last < hi:
+            stats.comparisons += 1
+            if not before(seq[last], key):
+                break
+            lo = last + 1
+            last = lo + step
+            step *= 2
+        hi = min(last, hi)
+        while lo < hi:
+            m = (lo + hi) // 2
+            stats.comparisons += 1
+            if before(seq[m], key):
+                lo = m + 1
+            else:
+                hi = m
+        return lo
+
+    def gallop_right(key, seq, lo, hi):
+        # First index in seq[lo:hi] whose element comes after key
+        step, last = 1, lo
+        while last < hi:
+            stats.comparisons += 1
+            if before(key, seq[last]):
+                break
+            lo = last + 1
+            last = lo + step
+            step *= 2
+        hi = min(last, hi)
+        while lo < hi:
+            m = (lo + hi) // 2
+            stats.comparisons += 1
+            if before(key, seq[m]):
+                hi = m
+            else:
+                lo = m + 1
+        return lo
+
+    def find_run(lo):
+        hi = lo + 1
+        if hi == n:
+            return hi
+        stats.comparisons += 1
+        if before(a[hi], a[lo]):
+            while hi + 1 < n:
+                stats.comparisons += 1
+                if not before(a[hi + 1], a[hi]):
+                    break
+                hi += 1
+            i, j = lo, hi
+            while i < j:
+                a[i], a[j] = a[j], a[i]
+                stats.swaps += 1
+                trace.swap(i, j)
+                i += 1
+                j -= 1
+        else:
+            while hi + 1 < n:
+                stats.comparisons += 1
+                if before(a[hi + 1], a[hi]):
+                    break
+                hi += 1
+        return hi + 1
+
+    def extend_run(lo, start, hi):
+        for i in range(start, hi):
+            key = a[i]
+            j = i - 1
+            while j >= lo:
+                stats.comparisons += 1
+                if not before(key, a[j]):
+                    break
+                put(j + 1, a[j])
+                j -= 1
+            if j + 1 != i:
+                put(j + 1, key)
+
+    def merge(lo, mid, hi):
+        # Left-run elements not after the right run's head, and right-run elements
+        # not before the left run's tail, are already in their final place.
+        lo = gallop_right(a[mid], a, lo, mid)
+        if lo == mid:
+            return
+        hi = gallop_left(a[mid - 1], a, mid, hi)
+        for p in range(lo, mid):
+            buf[p] = a[p]
+        i, j, k = lo, mid, lo
+        left_wins = right_wins = 0
+        while i < mid and j < hi:
+            stats.comparisons += 1
+            if before(a[j], buf[i]):
+                put(k, a[j])
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                put(k, buf[i])
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
+            if i < mid and j < hi:
+                if left_wins >= MIN_GALLOP:
+                    end = gallop_right(a[j], buf, i, mid)
+                    for p in range(i, end):
+                        put(k, buf[p])
+                        k += 1
+                    i, left_wins = end, 0
+                elif right_wins >= MIN_GALLOP:
+                    end = gallop_left(buf[i], a, j, hi)
+                    for p in range(j, end):
+                        put(k, a[p])
+                        k += 1
+                    j, right_wins = end, 0
+        while i < mid:
+            put(k, buf[i])
+            i += 1
+            k += 1
+
+    min_run = MIN_RUN
+    runs = [0]
+    lo = 0
+    while lo < n:
+        hi = find_run(lo)
+        forced = min(lo + min_run, n)
+        if hi < forced:
+            extend_run(lo, hi, forced)
+            hi = forced
+        runs.append(hi)
+        lo = hi
+    trace.mark()
+
+    passes = 0
+    while len(runs) > 2:
+        passes += 1
+        merged = [0]
+        for r in range(0, len(runs) - 2, 2):
+            merge(runs[r], runs[r + 1], runs[r + 2])
+            merged.append(runs[r + 2])
+        if (len(runs) - 1) % 2:
+            merged.append(runs[-1])
+        runs = merged
+        trace.mark()
+    stats.depth(passes)
+    return trace.finish(a)
+
+def counting_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    a = trace.begin()
+    if not a:
+        return trace.finish(a)
+    low, high = min(a), max(a)
+    if high - low + 1 > COUNTING_RANGE_LIMIT:
+        raise ValueError(f"Value range {high - low + 1} is too large for Counting Sort "
+                         f"(limit {COUNTING_RANGE_LIMIT}); use Radix Sort instead.")
+    counts = [0] * (high - low + 1)
+    for v in a:
+        counts[v - low] += 1
+    values = range(low, high + 1) if order == 'ASC' else range(high, low - 1, -1)
+    k = 0
+    for v in values:
+        for _ in range(counts[v - low]):
+            a[k] = v
+            trace.write(k, v)
+            k += 1
+    stats.writes += k
+    stats.depth(1)
+    return trace.finish(a)
+
+def radix_sort_history(arr, order, trace=None, stats=None):
+    trace = SortTrace(arr) if trace is None else trace
+    stats = SortStats() if stats is None else stats
+    a = trace.begin()
+    n = len(a)
+    if not n:
+        return trace.finish(a)
+    # Offsetting by the minimum makes every key non-negative
+    low = min(a)
+    max_key = max(a) - low
+    buf = [0] * n
+    shift = 1
+    passes = 0
+    while True:
+        counts = [0] * RADIX_BASE
+        for v in a:
+            d = (v - low) // shift % RADIX_BASE
+            counts[d if order == 'ASC' else RADIX_BASE - 1 - d] += 1
+        total = 0
+        for d in range(RADIX_BASE):
+            counts[d], total = total, total + counts[d]
+        for v in a:
+            d = (v - low) // shift % RADIX_BASE
+            d = d if order == 'ASC' else RADIX_BASE - 1 - d
+            buf[counts[d]] = v
+            counts[d] += 1
+        for k in range(n):
+            a[k] = buf[k]
+            trace.write(k, buf[k])
+        stats.writes += n
+        trace.mark()
+        passes += 1
+        shift *= RADIX_BASE
+        if shift > max_key:
+            break
+    stats.depth(passes)
+    return trace.finish(a)
+
+ALGORITHMS = {
+    'Bubble': bubble_sort_history,
+    'Insertion': insertion_sort_history,
+    'Quick': quick_sort_history,
+    'Merge': merge_sort_history,
+    'Introsort': introsort_history,
+    'Natural Merge': natural_merge_sort_history,
+    'Counting': counting_sort_history,
+    'Radix': radix_sort_history,
+}
+
+def run_sort(algorithm, arr, order, trace=None, stats=None):
+    stats = SortStats() if stats is None else stats
+    with stats.phase('sort'):
+        trace = ALGORITHMS[algorithm](arr, order, trace, stats)
+    trace.stats = stats
+    return trace
@@ -0,0 +1,77 @@
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from animation import (ANIMATION_HEIGHT, ANIMATION_WIDTH, ENCODE_BATCH, PARALLEL_MIN_FRAMES, encode_frames,
+                       export_animation, ffmpeg_available)
+from render import ValueColors
+from sorting import run_sort
+
+
+class CountingPool:
+    # Runs work immediately and records how many results were outstanding
+    def __init__(self):
+        self.outstanding = 0
+        self.peak = 0
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        self.outstanding += 1
+        self.peak = max(self.peak, self.outstanding)
+        original = future.result
+
+        def result(timeout=None):
+            self.outstanding -= 1
+            return original(timeout)
+        future.result = result
+        return future
+
+
+def sorted_trace(n=30, seed=0):
+    rng = random.Random(seed)
+    values = [rng.randint(-50, 50) for _ in range(n)]
+    return run_sort('Quick', values, 'ASC'), ValueColors.from_values(values)
+
+def test_gif_has_one_frame_per_sampled_step(tmp_path):
+    trace, colors = sorted_trace()
+    path = export_animation(trace, colors, str(tmp_path / 'a.gif'), max_frames=25)
+    with Image.open(path) as image:
+        assert image.size == (ANIMATION_WIDTH, ANIMATION_HEIGHT)
+        assert image.n_frames == min(len(trace), 25)
+        assert image.info.get('loop') == 0
+
+def test_short_trace_keeps_every_step(tmp_path):
+    trace, colors = sorted_trace(n=4)
+    path = export_animation(trace, colors, str(tmp_path / 'a.gif'))
+    with Image.open(path) as image:
+        assert image.n_frames == len(trace)
+
+def test_pool_output_matches_serial(tmp_path):
+    trace, colors = sorted_trace(n=40, seed=1)
+    assert min(len(trace), 80) >= PARALLEL_MIN_FRAMES
+    serial = export_animation(trace, colors, str(tmp_path / 'serial.gif'), max_frames=80)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        parallel = export_animation(trace, colors, str(tmp_path / 'parallel.gif'), max_frames=80,
+                                    pool=pool, max_in_flight=2)
+    assert open(serial, 'rb').read() == open(parallel, 'rb').read()
+
+def test_in_flight_batches_are_bounded():
+    trace, colors = sorted_trace(n=40, seed=2)
+    frames = (trace[step] for step in range(len(trace)))
+    pool = CountingPool()
+    encoded = list(encode_frames('MP4', frames, colors, 64, 32, 50, pool=pool, max_in_flight=3))
+    assert len(encoded) == len(trace)
+    assert len(trace) > 4 * ENCODE_BATCH
+    assert pool.peak == 3
+    first = np.frombuffer(encoded[0], dtype=np.uint8).reshape(32, 64, 3)
+    assert first.any()
+
+@pytest.mark.skipif(not ffmpeg_available(), reason="ffmpeg is not installed")
+def test_mp4_export(tmp_path):
+    trace, colors = sorted_trace()
+    path = export_animation(trace, colors, str(tmp_path / 'a.mp4'), fmt='MP4', max_frames=20)
+    assert open(path, 'rb').read(12)[4:8] == b'ftyp'
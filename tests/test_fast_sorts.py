@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from fast_sorts import FAST_SORTS, counting_sort, radix_sort
+from sorting import COUNTING_RANGE_LIMIT
+
+INTEGER_DTYPES = ['int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64']
+
+
+def full_range(dtype, size=2000, seed=0):
+    # Random values over the whole dtype plus both extremes
+    info = np.iinfo(dtype)
+    rng = np.random.default_rng(seed)
+    values = rng.integers(info.min, info.max, size=size, dtype=dtype, endpoint=True)
+    return np.concatenate([values, np.array([info.min, info.max, info.min, info.max], dtype=dtype)])
+
+def window(dtype, at, size=2000, width=1000, seed=0):
+    # Values within `width` of one end of the dtype's range
+    info = np.iinfo(dtype)
+    rng = np.random.default_rng(seed)
+    if at == 'min':
+        return (info.min + rng.integers(0, width, size=size, endpoint=True)).astype(dtype)
+    return (info.max - rng.integers(0, width, size=size, endpoint=True).astype(np.uint64)).astype(dtype)
+
+@pytest.mark.parametrize('dtype', INTEGER_DTYPES)
+@pytest.mark.parametrize('order', ['ASC', 'DESC'])
+def test_radix_full_range(dtype, order):
+    values = full_range(dtype)
+    expected = np.sort(values)
+    out = radix_sort(values, order)
+    assert out.dtype == values.dtype
+    assert np.array_equal(out, expected if order == 'ASC' else expected[::-1])
+
+@pytest.mark.parametrize('dtype', ['int8', 'int16', 'uint8', 'uint16'])
+@pytest.mark.parametrize('order', ['ASC', 'DESC'])
+def test_counting_full_range(dtype, order):
+    values = full_range(dtype)
+    expected = np.sort(values)
+    out = counting_sort(values, order)
+    assert out.dtype == values.dtype
+    assert np.array_equal(out, expected if order == 'ASC' else expected[::-1])
+
+@pytest.mark.parametrize('dtype', INTEGER_DTYPES)
+@pytest.mark.parametrize('at', ['min', 'max'])
+def test_counting_near_dtype_limits(dtype, at):
+    values = window(dtype, at)
+    assert np.array_equal(counting_sort(values), np.sort(values))
+
+def test_counting_int8_wrapping_offsets():
+    assert counting_sort(np.array([-100, 100, 5], dtype=np.int8)).tolist() == [-100, 5, 100]
+
+def test_counting_rejects_wide_ranges():
+    with pytest.raises(ValueError, match='too large for Counting Sort'):
+        counting_sort(np.array([0, COUNTING_RANGE_LIMIT]))
+
+@pytest.mark.parametrize('name', list(FAST_SORTS))
+def test_python_lists_and_empty_input(name):
+    assert FAST_SORTS[name]([3, -1, 2], 'DESC').tolist() == [3, 2, -1]
+    assert FAST_SORTS[name]([], 'ASC').tolist() == []
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from ingest import MAX_DIGITS, IngestError, load_file, parse_buffer, parse_text
+
+
+def test_parses_mixed_separators():
+    values = parse_text("5, -3;\t+8\r\n1  0\n-0")
+    assert values.dtype == np.int64
+    assert values.tolist() == [5, -3, 8, 1, 0, 0]
+
+def test_empty_input():
+    assert parse_text("").tolist() == []
+    assert parse_text(" ,\n;  ").tolist() == []
+
+def test_max_digits():
+    big = '9' * MAX_DIGITS
+    assert parse_text(f"{big} -{big}").tolist() == [int(big), -int(big)]
+    with pytest.raises(IngestError):
+        parse_text('1' * (MAX_DIGITS + 1))
+
+def test_matches_python_parsing_across_blocks():
+    rng = np.random.default_rng(0)
+    expected = rng.integers(-10 ** 12, 10 ** 12, size=5000)
+    text = ' '.join(map(str, expected.tolist())).encode()
+    # Small blocks force tokens to straddle block boundaries
+    values = parse_buffer(np.frombuffer(text, dtype=np.uint8), block_bytes=97)
+    assert values.tolist() == expected.tolist()
+
+@pytest.mark.parametrize('text, bad', [
+    ("1 2 x 4", ['x']),
+    ("1.5, 2", ['1.5']),
+    ("3 - 4", ['-']),
+    ("1 2-3 --4", ['2-3', '--4']),
+    ("7 1e3", ['1e3']),
+])
+def test_malformed_tokens_raise(text, bad):
+    with pytest.raises(IngestError) as info:
+        parse_text(text)
+    assert [token for _, token in info.value.bad_tokens] == bad
+
+@pytest.mark.parametrize('data, expected', [
+    (b"value\n3\n1\n", [3, 1]),
+    (b"a,b\n1,2\n", [1, 2]),
+    (b"id;val\r\n1;2\r\n", [1, 2]),
+    (b"5,3\n2\n", [5, 3, 2]),
+    (b"-1 +2\n", [-1, 2]),
+])
+def test_header_line_is_skipped_only_without_integers(data, expected):
+    assert load_file('data.csv', data).tolist() == expected
+
+@pytest.mark.parametrize('data', [
+    b"1.5,2,3\n4,5,6\n",
+    b"1 2 3 oops\n4\n",
+    b"value\nx\n",
+])
+def test_bad_data_lines_are_reported_not_skipped(data):
+    with pytest.raises(IngestError):
+        load_file('data.csv', data)
+
+def test_text_file_path_is_memory_mapped(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_bytes(b"n\n4 2 9\n")
+    assert load_file(str(path), str(path)).tolist() == [4, 2, 9]
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b"")
+    assert load_file(str(empty), str(empty)).tolist() == []
+
+def test_npy(tmp_path):
+    path = tmp_path / 'data.npy'
+    np.save(path, np.array([[3, 1], [2, 0]], dtype=np.int32))
+    assert load_file(str(path), str(path)).tolist() == [3, 1, 2, 0]
+    assert load_file('data.npy', path.read_bytes()).tolist() == [3, 1, 2, 0]
+    np.save(path, np.array([1.5]))
+    with pytest.raises(IngestError):
+        load_file(str(path), str(path))
+
+def test_raw_binary(tmp_path):
+    data = np.array([5, -1, 7], dtype=np.int16).tobytes()
+    assert load_file('data.bin', data, 'int16').tolist() == [5, -1, 7]
+    path = tmp_path / 'data.bin'
+    path.write_bytes(data)
+    assert load_file(str(path), str(path), 'int16').tolist() == [5, -1, 7]
+    with pytest.raises(IngestError):
+        load_file('data.bin', data[:-1], 'int16')
+    with pytest.raises(IngestError, match='dtype float64'):
+        load_file('data.bin', bytes(16), 'float64')
+
+def test_uint64_values_must_fit_int64(tmp_path):
+    fits = np.array([0, 2 ** 63 - 1], dtype=np.uint64)
+    assert load_file('data.bin', fits.tobytes(), 'uint64').tolist() == [0, 2 ** 63 - 1]
+    too_big = np.array([1, 2 ** 63], dtype=np.uint64)
+    with pytest.raises(IngestError, match='fit in int64'):
+        load_file('data.bin', too_big.tobytes(), 'uint64')
+    path = tmp_path / 'data.npy'
+    np.save(path, too_big)
+    with pytest.raises(IngestError, match='fit in int64'):
+        load_file(str(path), str(path))
@@ -0,0 +1,83 @@
+import pytest
+
+from interpreter import (BatchExecutor, ExecutionError, Executor, Lexer, LexerError, ParserError, format_array,
+                         parse_line, parse_script)
+
+
+def run(lines, **kwargs):
+    return [result for _, _, result in Executor(**kwargs).run_script(lines)]
+
+def test_lexer_tokens():
+    tokens = Lexer("SORT [3, -1] QUICK BY ASC # note").tokenize()
+    assert [t.type for t in tokens] == ['SORT', 'LBRACKET', 'NUMBER', 'COMMA', 'MINUS', 'NUMBER', 'RBRACKET',
+                                        'ALGORITHM', 'BY', 'ASC']
+    assert tokens[2].value == 3
+
+@pytest.mark.parametrize('line, message', [
+    ("SORT [1] BOGO BY ASC", "Unknown word 'BOGO'"),
+    ("SORT [1.5] QUICK BY ASC", "Invalid character '.'"),
+    ("sort [1] QUICK BY ASC", "Invalid character 's'"),
+])
+def test_lexer_errors(line, message):
+    with pytest.raises(LexerError, match=message):
+        parse_line(line)
+
+@pytest.mark.parametrize('line, message', [
+    ("QUICK", "Expected SORT or PRINT"),
+    ("SORT 1, 2] QUICK BY ASC", "Expected '\\['"),
+    ("SORT [1, 2 QUICK BY ASC", "Expected ',' or '\\]'"),
+    ("SORT [1,] QUICK BY ASC", "Expected a number"),
+    ("SORT [1, -] QUICK BY ASC", "Expected a number"),
+    ("SORT [1] BY ASC", "Expected an algorithm name"),
+    ("SORT [1] QUICK ASC", "Expected BY"),
+    ("SORT [1] QUICK BY", "Expected ASC or DESC"),
+    ("SORT [1] QUICK BY ASC PRINT", "Unexpected 'PRINT'"),
+    ("PRINT 3", "Unexpected 3"),
+])
+def test_parser_errors(line, message):
+    with pytest.raises(ParserError, match=message):
+        parse_line(line)
+
+def test_parse_sort_command():
+    assert parse_line("SORT [3, -1, 0] NATURAL_MERGE BY DESC") == {
+        'command': 'SORT', 'array': [3, -1, 0], 'algorithm': 'NATURAL_MERGE', 'order': 'DESC'}
+    assert parse_line("SORT [] BUBBLE BY ASC")['array'] == []
+    assert parse_line("   # comment only") is None
+
+def test_run_script_sorts_and_prints():
+    lines = ["SORT [3, 1, 2] QUICK BY ASC", "", "PRINT", "SORT [3, 1, 2] RADIX BY DESC"]
+    assert run(lines) == [[1, 2, 3], [1, 2, 3], [3, 2, 1]]
+    assert format_array([1, -2]) == "[1, -2]"
+
+def test_errors_carry_line_numbers_and_keep_going():
+    lines = ["SORT [2, 1] QUICK BY ASC", "SORT [1 QUICK BY ASC", "BOGUS", "PRINT"]
+    with pytest.raises(ParserError, match='line 2'):
+        list(parse_script(lines))
+    errors = []
+    results = [r for _, _, r in Executor().run_script(lines, keep_going=True, errors=errors)]
+    assert results == [[1, 2], [1, 2]]
+    assert [type(e) for e in errors] == [ParserError, LexerError]
+    assert str(errors[1]).startswith('line 3:')
+
+def test_values_outside_int64():
+    big = 10 ** 20
+    line = f"SORT [{big}, 1] INSERTION BY ASC"
+    # Non-recording runs keep arbitrary-precision integers
+    assert run([line]) == [[1, big]]
+    # Recording traces are int64 and report the overflow as an ExecutionError
+    with pytest.raises(ExecutionError, match='line 1: INSERTION failed'):
+        run([line], record=True)
+
+def test_algorithm_failure_is_execution_error():
+    with pytest.raises(ExecutionError, match='COUNTING failed'):
+        run([f"SORT [0, {10 ** 12}] COUNTING BY ASC"])
+
+def test_batch_executor_matches_sequential():
+    lines = [f"SORT [{i}, {-i}, 3] MERGE BY {'ASC' if i % 2 else 'DESC'}" for i in range(40)]
+    lines += ["PRINT", "SORT [1 MERGE BY ASC", f"SORT [{10 ** 20}, 2] INSERTION BY ASC"]
+    errors = []
+    batch = [(n, r) for n, _, r in BatchExecutor(max_workers=2, chunk_size=8).run_script(lines, True, errors)]
+    expected_errors = []
+    sequential = [(n, r) for n, _, r in Executor().run_script(lines, True, expected_errors)]
+    assert batch == sequential
+    assert [str(e) for e in errors] == [str(e) for e in expected_errors]
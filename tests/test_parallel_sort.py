@@ -0,0 +1,39 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from parallel_sort import PARALLEL_MIN_SIZE, choose_splitters, sample_sort
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+@pytest.mark.parametrize('dtype', ['int8', 'int16', 'int32', 'int64', 'uint16', 'uint64'])
+@pytest.mark.parametrize('order', ['ASC', 'DESC'])
+def test_pooled_sort_matches_numpy(pool, dtype, order):
+    info = np.iinfo(dtype)
+    values = np.random.default_rng(0).integers(info.min, info.max, size=PARALLEL_MIN_SIZE * 2,
+                                               dtype=dtype, endpoint=True)
+    expected = np.sort(values)
+    out = sample_sort(values, order, pool=pool, workers=2)
+    assert out.dtype == values.dtype
+    assert np.array_equal(out, expected if order == 'ASC' else expected[::-1])
+
+def test_skewed_input_and_more_buckets_than_workers(pool):
+    # Many duplicates leave some buckets empty
+    values = np.repeat(np.array([5, -1, 5, 3], dtype=np.int64), PARALLEL_MIN_SIZE // 2)
+    assert np.array_equal(sample_sort(values, 'ASC', pool=pool, workers=5), np.sort(values))
+
+def test_small_or_unpooled_input_sorts_in_process():
+    values = [3, -2, 9, 0]
+    assert sample_sort(values, 'DESC').tolist() == [9, 3, 0, -2]
+    assert sample_sort(values, 'ASC', pool=object()).tolist() == [-2, 0, 3, 9]
+
+def test_splitters_are_sorted_and_one_fewer_than_buckets():
+    values = np.random.default_rng(1).integers(-1000, 1000, size=10_000)
+    splitters = choose_splitters(values, 4)
+    assert len(splitters) == 3
+    assert np.all(np.diff(splitters) >= 0)
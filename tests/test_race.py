@@ -0,0 +1,58 @@
+import random
+from concurrent.futures import Future
+
+from race import QUADRATIC_SORTS, race_table, run_race
+from sorting import ALGORITHMS
+
+
+class StalledPool:
+    # Accepts work but never finishes it
+    def submit(self, fn, *args):
+        return Future()
+
+
+def random_values(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(-100, 100) for _ in range(n)]
+
+def test_every_engine_sorts_the_same_input():
+    values = random_values(200)
+    results = run_race(values, 'DESC', processes=False)
+    assert list(results) == list(ALGORITHMS)
+    for trace, error in results.values():
+        assert error is None
+        assert trace.result == sorted(values, reverse=True)
+    rows = race_table(results)
+    assert [row['Status'] for row in rows] == ['ok'] * len(ALGORITHMS)
+    assert all(row['Wall (ms)'] >= 0 for row in rows)
+
+def test_failures_are_reported_per_algorithm():
+    values = [0, 10 ** 12, 5]
+    results = run_race(values, 'ASC', algorithms=['Counting', 'Quick'], processes=False)
+    assert results['Counting'][0] is None
+    assert results['Counting'][1].startswith('ValueError: ')
+    assert results['Quick'][0].result == [0, 5, 10 ** 12]
+    assert results['Quick'][1] is None
+
+def test_overflow_is_reported_per_algorithm():
+    results = run_race([2 ** 63, 1], 'ASC', algorithms=['Merge'], processes=False)
+    assert results['Merge'][1].startswith('OverflowError')
+
+def test_quadratic_sorts_are_skipped_on_large_input():
+    values = random_values(50)
+    results = run_race(values, 'ASC', processes=False, max_quadratic=20)
+    for name in ALGORITHMS:
+        trace, error = results[name]
+        if name in QUADRATIC_SORTS:
+            assert trace is None and error.startswith('skipped')
+        else:
+            assert error is None and trace.result == sorted(values)
+
+def test_unfinished_engines_time_out():
+    results = run_race([3, 1, 2], 'ASC', algorithms=['Quick', 'Merge'], pool=StalledPool(), timeout=0.05)
+    assert results == {name: (None, 'timed out after 0.05 s') for name in ('Quick', 'Merge')}
+
+def test_process_pool_race():
+    values = random_values(100, seed=1)
+    results = run_race(values, 'ASC', algorithms=['Quick', 'Radix'])
+    assert all(trace.result == sorted(values) for trace, _ in results.values())
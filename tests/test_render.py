@@ -0,0 +1,100 @@
+import numpy as np
+from PIL import Image
+
+from render import (BACKGROUND, MAX_BINNED_LEGEND, TILE_HEADER, TILE_HEIGHT, TILE_PAD, TILE_WIDTH, TITLE_HEIGHT,
+                    FramePainter, ValueColors, frames_array, plot_frame_tiles, plot_history_grid, plot_legend_bar,
+                    render_frame, sample_rows)
+from sorting import KeyframeTrace, run_sort
+
+
+def test_sample_rows_keeps_ends():
+    assert sample_rows(5, 10) == [0, 1, 2, 3, 4]
+    rows = sample_rows(1000, 7)
+    assert rows[0] == 0 and rows[-1] == 999
+    assert len(rows) == 7 and rows == sorted(rows)
+
+def test_frames_array_matches_trace():
+    values = [5, -3, 8, 1, 0, 7, -2]
+    trace = run_sort('Merge', values, 'ASC')
+    rows = [0, 2, 3, len(trace) - 1]
+    assert frames_array(trace, rows).tolist() == [trace[r] for r in rows]
+    assert frames_array(trace).tolist() == list(trace)
+
+def test_frames_array_keyframes():
+    values = list(range(60, 0, -1))
+    trace = run_sort('Quick', values, 'ASC', KeyframeTrace(values, budget=8))
+    assert frames_array(trace).tolist() == list(trace)
+
+def test_bars_grow_from_the_baseline():
+    colors = ValueColors(-4, 4)
+    painter = FramePainter(colors, 3, width=30, height=40)
+    image = painter.paint([4, 0, -4])
+    background = np.all(image == BACKGROUND, axis=2)
+    painted = ~background
+    baseline = painter.baseline
+    # Positive bar above the baseline, zero bar empty, negative bar below
+    assert painted[:baseline, 0:10].any() and not painted[baseline + 1:, 0:10].any()
+    assert not painted[:, 10:20].any()
+    assert painted[baseline + 1:, 20:30].any() and not painted[:baseline, 20:30].any()
+    assert np.array_equal(image[baseline - 1, 5], colors.rgb([4])[0])
+
+def test_one_pixel_gap_between_wide_bars():
+    painter = FramePainter(ValueColors(1, 1), 4, width=40, height=20)
+    painted = ~np.all(painter.paint([1, 1, 1, 1]) == BACKGROUND, axis=2)
+    assert [painted[:, x].any() for x in (0, 10, 20, 30)] == [False] * 4
+    assert all(painted[:, x].any() for x in (1, 9, 11, 39))
+
+def test_render_frame_size_and_more_values_than_pixels():
+    frame = list(range(-500, 500))
+    image = render_frame(frame, ValueColors.from_values(frame), width=100, height=50)
+    assert image.shape == (50, 100, 3) and image.dtype == np.uint8
+
+def test_tiles_are_one_pil_image():
+    frames = np.array([[3, 1, 2], [1, 3, 2], [1, 2, 3], [1, 2, 3]])
+    image = plot_frame_tiles(frames, ['a', 'b', 'c', 'd'], ValueColors.from_values(frames), 'ASC', ncols=3)
+    assert isinstance(image, Image.Image)
+    tile_h = TILE_HEADER + TILE_HEIGHT + TILE_PAD
+    assert image.size == (3 * (TILE_WIDTH + TILE_PAD), TITLE_HEIGHT + 2 * tile_h)
+    pixels = np.asarray(image)
+    # The unused sixth tile stays blank; titles are drawn into the headers
+    assert np.all(pixels[TITLE_HEIGHT + tile_h:, 2 * (TILE_WIDTH + TILE_PAD):] == 255)
+    assert not np.all(pixels[TITLE_HEIGHT:TITLE_HEIGHT + TILE_HEADER, :TILE_WIDTH] == 255)
+
+def test_history_grid_samples_frames():
+    values = list(range(30, 0, -1))
+    trace = run_sort('Insertion', values, 'ASC')
+    image = plot_history_grid(trace, ValueColors.from_values(values), 'DESC', ncols=4, max_frames=8)
+    tile_h = TILE_HEADER + TILE_HEIGHT + TILE_PAD
+    assert image.size == (4 * (TILE_WIDTH + TILE_PAD), TITLE_HEIGHT + 2 * tile_h)
+
+def test_colors_span_the_value_range():
+    colors = ValueColors.from_values([-10, 0, 30])
+    assert (colors.low, colors.high) == (-10, 30)
+    assert colors.indices([-10, 30]).tolist() == [0, colors.levels - 1]
+    # Out-of-range values clamp to the ends of the colormap
+    assert colors.indices([-1000, 1000]).tolist() == [0, colors.levels - 1]
+    assert colors.rgb(np.arange(-10, 31)).shape == (41, 3)
+
+def test_colors_are_monotonic_and_bounded_for_many_values():
+    values = np.random.default_rng(0).integers(-10 ** 9, 10 ** 9, size=100_000)
+    colors = ValueColors.from_values(values)
+    indices = colors.indices(np.sort(values))
+    assert np.all(np.diff(indices) >= 0)
+    assert len(colors.lut) == colors.levels
+    assert len(np.unique(colors.rgb(values), axis=0)) <= colors.levels
+
+def test_single_value_and_empty_input():
+    assert ValueColors.from_values([7, 7]).indices([7]).tolist() == [0]
+    assert (ValueColors.from_values([]).low, ValueColors.from_values([]).high) == (0, 0)
+
+def test_legend_bins_few_values_and_uses_a_colorbar_otherwise():
+    import matplotlib.pyplot as plt
+    few = [3, 1, 3, 2]
+    fig = plot_legend_bar(ValueColors.from_values(few), few)
+    assert len(fig.axes[0].patches) == 3
+    assert [t.get_text() for t in fig.axes[0].texts] == ['1', '2', '3']
+    plt.close(fig)
+    many = list(range(MAX_BINNED_LEGEND + 1))
+    fig = plot_legend_bar(ValueColors.from_values(many), many)
+    assert len(fig.axes[0].patches) == 0 and not fig.axes[0].texts
+    plt.close(fig)
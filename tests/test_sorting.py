@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from sorting import ALGORITHMS, CHECKPOINT_MIN, KeyframeTrace, NullTrace, SortStats, SortTrace, run_sort
+
+
+def random_values(n, seed=0, low=-50, high=50):
+    rng = random.Random(seed)
+    return [rng.randint(low, high) for _ in range(n)]
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+@pytest.mark.parametrize('order', ['ASC', 'DESC'])
+def test_sorts_match_sorted(algorithm, order):
+    values = random_values(300, seed=1)
+    trace = run_sort(algorithm, values, order)
+    assert trace.result == sorted(values, reverse=order == 'DESC')
+    assert trace.initial == values
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+def test_replay_walks_from_initial_to_result(algorithm):
+    values = random_values(40, seed=2)
+    trace = run_sort(algorithm, values, 'ASC')
+    frames = list(trace)
+    assert len(frames) == len(trace) == trace.steps + 1
+    assert frames[0] == values
+    assert frames[-1] == trace.result
+    # Every step is a single swap or write
+    for before, after in zip(frames, frames[1:]):
+        assert sum(x != y for x, y in zip(before, after)) <= 2
+
+def test_compares_do_not_count_as_steps():
+    values = random_values(25, seed=4)
+    plain = run_sort('Quick', values, 'ASC', SortTrace(values))
+    compared = run_sort('Quick', values, 'ASC', SortTrace(values, compares=True))
+    assert compared.steps == plain.steps
+    assert list(compared) == list(plain)
+
+def test_recording_trace_rejects_values_outside_int64():
+    with pytest.raises(OverflowError):
+        run_sort('Insertion', [2 ** 70, 1], 'ASC')
+
+def test_stats_round_trip():
+    stats = run_sort('Quick', random_values(100), 'ASC').stats
+    assert stats.comparisons > 0
+    assert SortStats.from_dict(stats.as_dict()).as_dict() == stats.as_dict()
+
+def test_keyframe_trace_stays_within_budget():
+    values = random_values(500, seed=6)
+    full = run_sort('Quick', values, 'ASC')
+    trace = run_sort('Quick', values, 'ASC', KeyframeTrace(values, budget=16))
+    assert len(trace) <= 17
+    assert trace[0] == values
+    assert trace[-1] == full.result
+    for step, frame in zip(trace.frame_steps(), trace):
+        assert frame == full[step]
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+def test_random_access_matches_replay_at_every_step(algorithm):
+    # Small checkpoint interval so most steps sit between two checkpoints
+    values = random_values(40, seed=2)
+    trace = ALGORITHMS[algorithm](values, 'ASC', SortTrace(values, every=7))
+    frames = list(trace)
+    assert len(frames) == len(trace) == trace.steps + 1
+    assert frames[0] == values
+    assert frames[-1] == trace.result
+    for step, frame in enumerate(frames):
+        assert trace[step] == frame
+    assert trace[-1] == trace.result
+
+def test_checkpoints_land_every_interval():
+    values = random_values(30, seed=3)
+    trace = run_sort('Bubble', values, 'ASC', SortTrace(values, every=10))
+    assert trace.checkpoint_steps == list(range(0, trace.steps + 1, 10))
+    for step, (pos, frame) in zip(trace.checkpoint_steps, trace.checkpoints):
+        assert pos % 3 == 0
+        assert frame.tolist() == trace[step]
+
+def test_default_checkpoint_interval():
+    assert SortTrace([1, 2, 3]).every == CHECKPOINT_MIN
+    assert SortTrace(list(range(1000))).every == 1000
+
+def test_index_out_of_range():
+    trace = run_sort('Insertion', [3, 1, 2], 'ASC')
+    with pytest.raises(IndexError):
+        trace[len(trace)]
+    with pytest.raises(IndexError):
+        trace[-len(trace) - 1]
+    assert trace.at_step(10 ** 6) == [1, 2, 3]
+    assert trace.at_step(-5) == [3, 1, 2]
+
+def test_null_trace_counts_steps_only():
+    values = random_values(50, seed=5)
+    trace = run_sort('Merge', values, 'ASC', NullTrace(values))
+    assert trace.steps == run_sort('Merge', values, 'ASC').steps
+    assert len(trace.ops) == 0
+    assert trace.checkpoints == []
+
+def test_null_trace_accepts_values_outside_int64():
+    values = [2 ** 70, -(2 ** 70), 5]
+    assert run_sort('Insertion', values, 'ASC', NullTrace(values)).result == sorted(values)
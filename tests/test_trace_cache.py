@@ -0,0 +1,34 @@
+from trace_cache import TraceCache, figure_key, history_key, sizeof
+
+
+def test_lru_eviction_by_bytes():
+    cache = TraceCache(max_bytes=1000)
+    cache.put('a', b'x' * 400)
+    cache.put('b', b'x' * 400)
+    assert cache.get('a') is not None
+    cache.put('c', b'x' * 400)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+    assert cache.current_bytes <= cache.max_bytes
+
+def test_oversized_values_are_not_cached():
+    cache = TraceCache(max_bytes=100)
+    assert cache.put('a', b'x' * 500) == b'x' * 500
+    assert len(cache) == 0
+
+def test_get_or_compute_computes_once():
+    cache = TraceCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('k', lambda: calls.append(1) or b'png') == b'png'
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 2
+
+def test_tuple_values_count_their_items():
+    assert sizeof((b'x' * 1000, {'render': 0.5})) > 1000
+
+def test_keys_separate_variants():
+    arr = [3, 1, 2]
+    assert history_key(arr, 'Quick', 'ASC') != history_key(arr, 'Quick', 'ASC', 'keyframes')
+    assert figure_key('Heatmap', arr, 'Quick', 'ASC') != figure_key('Bar Grid', arr, 'Quick', 'ASC')
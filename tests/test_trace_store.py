@@ -0,0 +1,147 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from sorting import ALGORITHMS, SortTrace, run_sort
+from trace_store import HEADER, TraceFile, TraceStoreError, record_trace
+
+
+def random_values(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.randint(-100, 100) for _ in range(n)]
+
+def with_metadata(path, out, meta):
+    # Copies a trace file, replacing its JSON trailer
+    data = open(path, 'rb').read()
+    fields = list(HEADER.unpack(data[:HEADER.size]))
+    body = data[HEADER.size:len(data) - fields[-1]]
+    fields[-1] = len(meta)
+    out.write_bytes(HEADER.pack(*fields) + body + meta)
+    return out
+
+def patch_words(path, offset, values):
+    # Overwrites int64 words of a trace file, counted from the end of the header
+    data = bytearray(path.read_bytes())
+    start = HEADER.size + 8 * offset
+    data[start:start + 8 * len(values)] = np.array(values, dtype='<i8').tobytes()
+    path.write_bytes(bytes(data))
+
+def recorded(tmp_path, algorithm='Insertion', values=None):
+    path = tmp_path / 't.sorttrace'
+    return path, record_trace(algorithm, values or random_values(20), 'ASC', str(path), every=8)
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+def test_trace_file_matches_in_memory_trace(tmp_path, algorithm):
+    values = random_values(60, seed=1)
+    memory = run_sort(algorithm, values, 'DESC', SortTrace(values))
+    stored = record_trace(algorithm, values, 'DESC', str(tmp_path / 't.sorttrace'), every=13)
+    assert stored.steps == memory.steps
+    assert stored.initial == values
+    assert stored.result == memory.result
+    assert list(stored) == list(memory)
+    for step in range(len(memory)):
+        assert stored[step] == memory[step]
+    assert stored.metadata['algorithm'] == algorithm
+    assert stored.metadata['order'] == 'DESC'
+    assert stored.stats.as_dict()['swaps'] == memory.stats.swaps
+
+def test_frames_matches_random_access(tmp_path):
+    values = random_values(40, seed=2)
+    stored = record_trace('Insertion', values, 'ASC', str(tmp_path / 't.sorttrace'), every=9)
+    rows = [0, 1, 5, 9, 10, 31, stored.steps]
+    assert np.array_equal(stored.frames(rows), np.array([stored[r] for r in rows]))
+
+def test_checkpoint_steps(tmp_path):
+    values = random_values(30, seed=3)
+    stored = record_trace('Bubble', values, 'ASC', str(tmp_path / 't.sorttrace'), every=10)
+    expected = list(range(0, stored.steps, 10))
+    if expected[-1] != stored.steps:
+        expected.append(stored.steps)
+    assert stored.checkpoint_steps == expected
+    assert stored.checkpoints[-1].tolist() == sorted(values)
+
+def test_failed_sort_leaves_no_file(tmp_path):
+    path = tmp_path / 't.sorttrace'
+    with pytest.raises(ValueError):
+        record_trace('Counting', [0, 10 ** 12], 'ASC', str(path))
+    assert not path.exists()
+
+def test_rejects_non_trace_files(tmp_path):
+    path = tmp_path / 'x.sorttrace'
+    path.write_bytes(b'short')
+    with pytest.raises(TraceStoreError, match='too small'):
+        TraceFile(str(path))
+    path.write_bytes(b'NOTATRACE' * 10)
+    with pytest.raises(TraceStoreError, match='magic'):
+        TraceFile(str(path))
+
+def test_rejects_truncated_file(tmp_path):
+    path = tmp_path / 't.sorttrace'
+    record_trace('Quick', random_values(20), 'ASC', str(path))
+    data = path.read_bytes()
+    path.write_bytes(data[:-20])
+    with pytest.raises(TraceStoreError, match='truncated'):
+        TraceFile(str(path))
+
+@pytest.mark.parametrize('meta, message', [
+    (b'{not json', 'not valid JSON'),
+    (b'\xff\xfe', 'not valid JSON'),
+    (b'[1, 2]', 'JSON object'),
+    (json.dumps({'algorithm': 'Bogo', 'order': 'ASC'}).encode(), 'Unknown algorithm'),
+    (json.dumps({'algorithm': 'Quick', 'order': 'UP'}).encode(), 'Unknown order'),
+    (json.dumps({'stats': [1]}).encode(), 'malformed stats'),
+])
+def test_rejects_bad_metadata(tmp_path, meta, message):
+    path = tmp_path / 't.sorttrace'
+    record_trace('Quick', random_values(20), 'ASC', str(path))
+    with pytest.raises(TraceStoreError, match=message):
+        TraceFile(str(with_metadata(path, tmp_path / 'bad.sorttrace', meta)))
+
+@pytest.mark.parametrize('op', [(2, 0, 1), (7, 0, 1), (-1, 0, 1)])
+def test_rejects_unknown_operation_kind(tmp_path, op):
+    path, stored = recorded(tmp_path)
+    patch_words(path, stored.n, op)
+    with pytest.raises(TraceStoreError, match='operation kind'):
+        TraceFile(str(path))
+
+@pytest.mark.parametrize('op', [(0, 10 ** 6, 1), (0, 1, 20), (0, -1, 1), (1, 20, 5), (1, -3, 5)])
+def test_rejects_operation_index_outside_array(tmp_path, op):
+    path, stored = recorded(tmp_path)
+    patch_words(path, stored.n, op)
+    with pytest.raises(TraceStoreError, match='index outside'):
+        TraceFile(str(path))
+
+def test_write_values_are_not_indices(tmp_path):
+    path, stored = recorded(tmp_path)
+    patch_words(path, stored.n, (1, 0, 10 ** 12))
+    assert TraceFile(str(path))[1][0] == 10 ** 12
+
+@pytest.mark.parametrize('change', ['first', 'decreasing', 'past_end'])
+def test_rejects_invalid_checkpoint_table(tmp_path, change):
+    path, stored = recorded(tmp_path)
+    table = list(stored.checkpoint_steps)
+    assert len(table) >= 3
+    if change == 'first':
+        table[0] = 1
+    elif change == 'decreasing':
+        table[1], table[2] = table[2], table[1]
+    else:
+        table[-1] = stored.steps + 1
+    patch_words(path, stored.n + 3 * stored.steps, table)
+    with pytest.raises(TraceStoreError, match='checkpoint table'):
+        TraceFile(str(path))
+
+@pytest.mark.parametrize('stats', [
+    {'comparisons': 'x'},
+    {'swaps': 1.5},
+    {'max_depth': None},
+    {'writes': True},
+    {'timings': {'sort': 'fast'}},
+])
+def test_rejects_non_numeric_stats(tmp_path, stats):
+    path, _ = recorded(tmp_path)
+    meta = json.dumps({'algorithm': 'Insertion', 'order': 'ASC', 'stats': stats}).encode()
+    with pytest.raises(TraceStoreError, match='malformed stats'):
+        TraceFile(str(with_metadata(path, tmp_path / 'bad.sorttrace', meta)))
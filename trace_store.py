@@ -0,0 +1,257 @@
+import json
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+from sorting import ALGORITHMS, SWAP, WRITE, SortStats, SortTrace, run_sort
+
+# --- On-Disk Trace Store (initial array + operation log + checkpoints) ---
+# File layout, all integers little-endian int64:
+#   header | initial[n] | ops[3 * steps] | checkpoint steps[checkpoints]
+#   | checkpoint frames[checkpoints * n] | marks[mark_count] | JSON metadata
+# Operations are appended while the sort runs. Checkpoint frames are spooled
+# to a temporary file and copied after the log in close(), which then
+# rewrites the header with the final counts.
+MAGIC = b'SORTTRC1'
+VERSION = 1
+HEADER = struct.Struct('<8s7q')
+TRACE_EXTENSION = '.sorttrace'
+FLUSH_OPS = 1 << 16
+
+
+class TraceStoreError(ValueError):
+    pass
+
+
+class TraceWriter(SortTrace):
+    # Streams a sort to `path` as it runs. A full copy of the array is
+    # checkpointed every `every` steps (default: every n steps, so checkpoints
+    # take about as much space as the operation log). Compares are not stored.
+    def __init__(self, initial, path, every=None):
+        super().__init__(initial)
+        self.path = path
+        self.every = every or max(1024, len(self.initial))
+        self.next_checkpoint = self.every
+        self.checkpoint_steps = array('q')
+        self._file = open(path, 'wb')
+        self._frames = tempfile.TemporaryFile()
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(self.initial), 0, 0, self.every, 0, 0))
+        array('q', self.initial).tofile(self._file)
+        self._checkpoint(self.initial)
+
+    def _checkpoint(self, frame):
+        self.checkpoint_steps.append(self.steps)
+        array('q', frame).tofile(self._frames)
+        self.next_checkpoint = self.steps + self.every
+
+    def _append(self, kind, a, b):
+        self.ops.extend((kind, a, b))
+        self.steps += 1
+        if len(self.ops) >= 3 * FLUSH_OPS:
+            self.ops.tofile(self._file)
+            del self.ops[:]
+        if self.steps >= self.next_checkpoint:
+            self._checkpoint(self._work)
+
+    def swap(self, i, j):
+        self._append(SWAP, i, j)
+
+    def write(self, k, value):
+        self._append(WRITE, k, value)
+
+    def compare(self, i, j):
+        pass
+
+    def finish(self, a):
+        self.ops.tofile(self._file)
+        del self.ops[:]
+        if self.checkpoint_steps[-1] != self.steps:
+            self._checkpoint(a)
+        return super().finish(a)
+
+    def close(self, metadata=None):
+        # Appends everything that follows the operation log; call after finish()
+        self.checkpoint_steps.tofile(self._file)
+        self._frames.seek(0)
+        while True:
+            chunk = self._frames.read(1 << 20)
+            if not chunk:
+                break
+            self._file.write(chunk)
+        self._frames.close()
+        self.marks.tofile(self._file)
+        meta = json.dumps(metadata or {}).encode()
+        self._file.write(meta)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(self.initial), self.steps,
+                                     len(self.checkpoint_steps), self.every, len(self.marks), len(meta)))
+        self._file.close()
+
+    def abort(self):
+        self._frames.close()
+        self._file.close()
+        os.remove(self.path)
+
+
+def read_metadata(data):
+    # The JSON trailer is user-supplied for uploaded files: anything the app
+    # would act on is checked here and reported as a TraceStoreError.
+    try:
+        metadata = json.loads(data or b'{}')
+    except (UnicodeDecodeError, ValueError) as e:
+        raise TraceStoreError(f"Trace metadata is not valid JSON: {e}") from e
+    if not isinstance(metadata, dict):
+        raise TraceStoreError("Trace metadata must be a JSON object.")
+    if 'algorithm' in metadata and metadata['algorithm'] not in ALGORITHMS:
+        raise TraceStoreError(f"Unknown algorithm in trace metadata: {metadata['algorithm']!r}.")
+    if 'order' in metadata and metadata['order'] not in ('ASC', 'DESC'):
+        raise TraceStoreError(f"Unknown order in trace metadata: {metadata['order']!r}.")
+    stats = metadata.get('stats')
+    if stats is not None and not _valid_stats(stats):
+        raise TraceStoreError("Trace metadata has malformed stats.")
+    return metadata
+
+def _valid_stats(stats):
+    if not isinstance(stats, dict) or not isinstance(stats.get('timings', {}), dict):
+        return False
+    counters = [stats.get(name, 0) for name in ('comparisons', 'swaps', 'writes', 'max_depth')]
+    timings = list(stats.get('timings', {}).values())
+    return (all(type(value) is int for value in counters)
+            and all(type(value) in (int, float) for value in timings))
+
+def check_ops(ops, n):
+    # Every operation must be a swap or a write whose indices lie in [0, n);
+    # checked in blocks so a large log is never copied whole into memory
+    for start in range(0, len(ops), FLUSH_OPS):
+        block = np.asarray(ops[start:start + FLUSH_OPS])
+        kind, a, b = block[:, 0], block[:, 1], block[:, 2]
+        if not np.all((kind == SWAP) | (kind == WRITE)):
+            raise TraceStoreError("Trace file has an unknown operation kind.")
+        if not np.all((a >= 0) & (a < n)) or not np.all((kind != SWAP) | ((b >= 0) & (b < n))):
+            raise TraceStoreError("Trace file has an operation index outside the array.")
+
+def check_checkpoint_steps(checkpoint_steps, steps):
+    steps_array = np.asarray(checkpoint_steps)
+    if steps_array[0] != 0 or np.any(np.diff(steps_array) < 0) or steps_array[-1] > steps:
+        raise TraceStoreError("Trace file has an invalid checkpoint table.")
+
+
+class TraceFile:
+    # Read-only, memory-mapped view of a finished trace file. A step is rebuilt
+    # from the nearest checkpoint at or before it, so random access replays at
+    # most `every` operations and never reads the whole trace.
+    def __init__(self, path):
+        self.path = path
+        self.size = size = os.path.getsize(path)
+        if size < HEADER.size:
+            raise TraceStoreError("File is too small to be a sort trace.")
+        with open(path, 'rb') as f:
+            magic, version, n, steps, checkpoints, every, mark_count, meta_len = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise TraceStoreError("Not a sort trace file (bad magic number).")
+            if version != VERSION:
+                raise TraceStoreError(f"Unsupported trace file version {version}.")
+            if min(n, steps, checkpoints, mark_count, meta_len) < 0:
+                raise TraceStoreError("Trace file header has negative counts.")
+            words = n + 3 * steps + checkpoints + checkpoints * n + mark_count
+            if checkpoints == 0 or size != HEADER.size + 8 * words + meta_len:
+                raise TraceStoreError("Trace file is truncated or was not finished.")
+            f.seek(HEADER.size + 8 * words)
+            self.metadata = read_metadata(f.read(meta_len))
+
+        data = np.memmap(path, dtype='<i8', mode='r', offset=HEADER.size, shape=(words,))
+        self.n = n
+        self.steps = steps
+        self.every = every
+        self.initial_array = data[:n]
+        pos = n
+        self.ops = data[pos:pos + 3 * steps].reshape(steps, 3)
+        pos += 3 * steps
+        check_ops(self.ops, n)
+        self.checkpoint_steps = data[pos:pos + checkpoints].tolist()
+        check_checkpoint_steps(self.checkpoint_steps, steps)
+        pos += checkpoints
+        self.checkpoints = data[pos:pos + checkpoints * n].reshape(checkpoints, n)
+        pos += checkpoints * n
+        self.marks = data[pos:pos + mark_count]
+        self.stats = SortStats.from_dict(self.metadata['stats']) if 'stats' in self.metadata else None
+
+    @property
+    def initial(self):
+        return self.initial_array.tolist()
+
+    @property
+    def result(self):
+        return self.checkpoints[-1].tolist()
+
+    def nbytes(self):
+        return self.size
+
+    def frame_steps(self):
+        return range(self.steps + 1)
+
+    def __len__(self):
+        return self.steps + 1
+
+    def _replay(self, a, start, stop):
+        # Applies operations start..stop-1 to `a`, yielding after each one
+        for kind, x, y in self.ops[start:stop].tolist():
+            if kind == SWAP:
+                a[x], a[y] = a[y], a[x]
+            else:
+                a[x] = y
+            yield a
+
+    def __iter__(self):
+        bounds = self.checkpoint_steps[1:] + [self.steps + 1]
+        for c, (start, stop) in enumerate(zip(self.checkpoint_steps, bounds)):
+            a = self.checkpoints[c].tolist()
+            yield a[:]
+            for frame in self._replay(a, start, stop - 1):
+                yield frame[:]
+
+    def __getitem__(self, step):
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError("trace step out of range")
+        c = bisect_right(self.checkpoint_steps, step) - 1
+        a = self.checkpoints[c].tolist()
+        for _ in self._replay(a, self.checkpoint_steps[c], step):
+            pass
+        return a
+
+    def frames(self, rows):
+        # Sorted step indices -> one 2D array. Replay continues forward from the
+        # previous row unless a later checkpoint is closer.
+        out = np.empty((len(rows), self.n), dtype=np.int64)
+        a, at = None, None
+        for r, step in enumerate(rows):
+            c = bisect_right(self.checkpoint_steps, step) - 1
+            if a is None or at > step or self.checkpoint_steps[c] > at:
+                a, at = self.checkpoints[c].tolist(), self.checkpoint_steps[c]
+            for _ in self._replay(a, at, step):
+                pass
+            at = step
+            out[r] = a
+        return out
+
+    def at_step(self, step):
+        # Array state after `step` operations, holding the final state past the end
+        return self[min(max(step, 0), self.steps)]
+
+
+def record_trace(algorithm, arr, order, path, every=None):
+    # Runs a sort straight into a trace file and returns it opened for replay
+    writer = TraceWriter(arr, path, every)
+    try:
+        trace = run_sort(algorithm, arr, order, writer)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close({'algorithm': algorithm, 'order': order, 'stats': trace.stats.as_dict()})
+    return TraceFile(path)